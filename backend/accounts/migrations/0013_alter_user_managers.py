@@ -0,0 +1,20 @@
+# Generated by Django 3.2.3 on 2026-10-18 18:20
+
+import accounts.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_alter_user_options'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', accounts.models.UserQuerySetManager()),
+            ],
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
 
 from accounts.constants import (
@@ -10,6 +10,29 @@ from accounts.constants import (
 from accounts.validators import username_validator
 
 
+class UserQuerySet(models.QuerySet):
+    """Набор запросов для модели пользователя."""
+
+    def with_subscription_flag(self, user):
+        """Добавление признака подписки пользователя user."""
+        if not user.is_authenticated:
+            return self.annotate(is_subscribed=models.Value(
+                False,
+                output_field=models.BooleanField()
+            ))
+        follow = self.model._meta.get_field('following').related_model
+        return self.annotate(is_subscribed=models.Exists(
+            follow.objects.filter(
+                user_id=user.id,
+                following_id=models.OuterRef('pk')
+            )
+        ))
+
+
+class UserQuerySetManager(UserManager.from_queryset(UserQuerySet)):
+    """Менеджер модели пользователя."""
+
+
 class User(AbstractUser):
     """Модель пользователя."""
 
@@ -47,6 +70,8 @@ class User(AbstractUser):
         null=True
     )
 
+    objects = UserQuerySetManager()
+
     class Meta:
         """Дополнительные настройки модели."""
 
@@ -9,6 +9,7 @@ from accounts.constants import (
 )
 from accounts.models import User
 from foodgram_api.fields import Base64ImageField
+from foodgram_api.images import get_variant_urls
 
 
 class AvatarCreateDeleteSerializer(serializers.ModelSerializer):
@@ -86,6 +87,7 @@ class UsersGetListSerializer(
     """Сериализатор для получения профиля или списка профилей."""
 
     is_subscribed = serializers.SerializerMethodField()
+    avatar_variants = serializers.SerializerMethodField()
 
     class Meta:
         """Дополнительные настройки сериализатора."""
@@ -99,15 +101,23 @@ class UsersGetListSerializer(
             'email',
             'is_subscribed',
             'avatar',
-            'avatar_url'
+            'avatar_url',
+            'avatar_variants'
         ]
 
     def get_is_subscribed(self, obj):
         """Проверка подписки на данного пользователя."""
+        is_subscribed = getattr(obj, 'is_subscribed', None)
+        if is_subscribed is not None:
+            return is_subscribed
         return obj.following.filter(
             user_id=self.context['request'].user.id
         ).exists()
 
+    def get_avatar_variants(self, obj):
+        """Получение ссылок на уменьшенные копии аватара."""
+        return get_variant_urls(obj.avatar)
+
 
 class SetPasswordSerializer(serializers.ModelSerializer):
     """Сериализатор для изменения пароля."""
@@ -1,3 +1,6 @@
+from collections import defaultdict
+
+from django.db.models import Count
 from django.shortcuts import get_object_or_404
 from rest_framework import (
     filters,
@@ -17,10 +20,12 @@ from accounts.serializers import (
     UserCreateSerializer,
     UsersGetListSerializer
 )
+from recipes.models import Recipe
 from recipes.permissions import IsSafeMethodOrAuthor
 from subscriptions.serializers import (
     FollowSerializer,
-    SubscribtionsSerializer
+    SubscribtionsSerializer,
+    get_recipes_limit
 )
 
 
@@ -32,6 +37,10 @@ class UsersViewSet(viewsets.ModelViewSet):
     filter_backends = (filters.SearchFilter,)
     search_fields = ('username',)
 
+    def get_queryset(self):
+        """Получение пользователей с признаком подписки."""
+        return User.objects.with_subscription_flag(self.request.user)
+
     def get_serializer_class(self):
         """Выбор сериализатора."""
         if (self.request.method in permissions.SAFE_METHODS):
@@ -74,11 +83,20 @@ class UsersViewSet(viewsets.ModelViewSet):
     def subscriptions(self, request):
         """Получение списка подписок."""
         queryset = request.user.follower.values('following')
-        authors = User.objects.filter(
+        authors = User.objects.with_subscription_flag(request.user).filter(
             id__in=queryset
-        )
+        ).annotate(recipes_count=Count('recipes'))
+        page = self.paginate_queryset(authors)
+        recipes = defaultdict(list)
+        for recipe in Recipe.objects.latest_by_author(
+            [author.id for author in page],
+            get_recipes_limit(request)
+        ):
+            recipes[recipe.author_id].append(recipe)
+        for author in page:
+            author.recipe_previews = recipes[author.id]
         serializer = SubscribtionsSerializer(
-            self.paginate_queryset(authors),
+            page,
             many=True,
             context=self.get_serializer_context()
         )
@@ -7,3 +7,7 @@ class FavoritesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'favorites'
     verbose_name = "Избранное"
+
+    def ready(self):
+        """Подключение обработчиков сигналов."""
+        import favorites.signals  # noqa: F401
@@ -0,0 +1,27 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from favorites.models import Favorite
+from recipes.models import Recipe
+
+
+def update_recipe_counter(recipe_id, field, delta):
+    """Атомарное изменение счётчика рецепта."""
+    Recipe.objects.filter(id=recipe_id).update(
+        **{field: Greatest(F(field) + delta, 0)}
+    )
+
+
+@receiver(post_save, sender=Favorite)
+def increment_favorites_count(sender, instance, created, **kwargs):
+    """Увеличение счётчика избранного при добавлении рецепта."""
+    if created:
+        update_recipe_counter(instance.recipe_id, 'favorites_count', 1)
+
+
+@receiver(post_delete, sender=Favorite)
+def decrement_favorites_count(sender, instance, **kwargs):
+    """Уменьшение счётчика избранного при удалении рецепта."""
+    update_recipe_counter(instance.recipe_id, 'favorites_count', -1)
@@ -6,6 +6,8 @@ from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView
 from rest_framework import routers
 
 from accounts.views import UsersViewSet
+from foodgram_api.constants import IMAGE_VARIANTS_DIR
+from foodgram_api.views import image_variant
 
 router_v1 = routers.DefaultRouter()
 router_v1.register('', UsersViewSet, basename='users')
@@ -22,6 +24,12 @@ urlpatterns = [
     path('user/<int:id>/', include(router_v1.urls)),
     path('users/', include('accounts.urls', namespace='accounts')),
     path('recipes/', include('recipes.urls', namespace='recipes')),
+    path(
+        f'{settings.MEDIA_URL.strip("/")}/{IMAGE_VARIANTS_DIR}/'
+        '<str:variant>/<path:name>',
+        image_variant,
+        name='image_variant'
+    ),
 ]
 
 if settings.DEBUG:
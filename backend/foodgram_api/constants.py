@@ -0,0 +1,17 @@
+IMAGE_VARIANTS = {
+    'small': (160, 160),
+    'medium': (480, 480),
+    'large': (960, 960),
+}
+IMAGE_VARIANT_FORMATS = {'webp': 'WEBP', 'jpg': 'JPEG'}
+IMAGE_VARIANT_QUALITY = 80
+IMAGE_VARIANT_BACKGROUND = (255, 255, 255)
+IMAGE_VARIANT_SOURCES = ('images/', 'avatars/')
+IMAGE_VARIANTS_DIR = 'variants'
+IMAGE_VARIANT_MAX_AGE = 30 * 24 * 60 * 60
+TEMPORARY_PREFIX = '.tmp'
+HASH_CHUNK_SIZE = 64 * 1024
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_QUERY_PARAM = 'profile'
+PROFILE_RESPONSE_HEADER = 'X-Profile'
+PROFILE_SUFFIX = '.prof'
@@ -0,0 +1,95 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from foodgram_api.constants import (
+    IMAGE_VARIANT_BACKGROUND,
+    IMAGE_VARIANT_FORMATS,
+    IMAGE_VARIANT_QUALITY,
+    IMAGE_VARIANT_SOURCES,
+    IMAGE_VARIANTS,
+    IMAGE_VARIANTS_DIR,
+    TEMPORARY_PREFIX
+)
+
+
+def get_variant_name(name, variant, extension):
+    """Имя уменьшенной копии изображения в хранилище."""
+    return f'{IMAGE_VARIANTS_DIR}/{variant}/{name}.{extension}'
+
+
+def get_variant_urls(image):
+    """
+    Ссылки на уменьшенные копии изображения.
+
+    Копии создаются при первом запросе ссылки, дальше nginx отдаёт
+    готовые файлы из media.
+    """
+    if not image:
+        return None
+    return {
+        variant: {
+            extension: default_storage.url(
+                get_variant_name(image.name, variant, extension)
+            )
+            for extension in IMAGE_VARIANT_FORMATS
+        }
+        for variant in IMAGE_VARIANTS
+    }
+
+
+def is_variant_source(name):
+    """Проверка, что для файла можно создавать уменьшенные копии."""
+    return (
+        name.startswith(IMAGE_VARIANT_SOURCES)
+        and '..' not in Path(name).parts
+        and default_storage.exists(name)
+    )
+
+
+def create_variant(name, variant, extension):
+    """
+    Создание уменьшенной копии изображения на диске.
+
+    Файл записывается во временный и переименовывается, так что
+    параллельные запросы одной копии не видят её недописанной.
+    Возвращает путь к готовому файлу.
+    """
+    path = Path(settings.MEDIA_ROOT) / get_variant_name(
+        name,
+        variant,
+        extension
+    )
+    if path.exists():
+        return path
+    image_format = IMAGE_VARIANT_FORMATS[extension]
+    with default_storage.open(name) as source, Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(IMAGE_VARIANTS[variant], Image.LANCZOS)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        if image_format == 'JPEG' and image.mode == 'RGBA':
+            background = Image.new('RGB', image.size, IMAGE_VARIANT_BACKGROUND)
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent,
+            prefix=TEMPORARY_PREFIX,
+            delete=False
+        ) as output:
+            try:
+                image.save(
+                    output,
+                    format=image_format,
+                    quality=IMAGE_VARIANT_QUALITY
+                )
+            except Exception:
+                os.unlink(output.name)
+                raise
+    os.replace(output.name, path)
+    return path
@@ -0,0 +1,203 @@
+import cProfile
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.utils import timezone
+from django.utils.text import slugify
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from foodgram_api.constants import (
+    PROFILE_HEADER,
+    PROFILE_QUERY_PARAM,
+    PROFILE_RESPONSE_HEADER,
+    PROFILE_SUFFIX
+)
+
+logger = logging.getLogger(__name__)
+
+
+def get_view_name(view_func, method):
+    """Имя представления вида RecipeViewSet.list."""
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return view_func.__qualname__
+    method = method.lower()
+    actions = getattr(view_func, 'actions', None) or {}
+    return f'{view_class.__name__}.{actions.get(method, method)}'
+
+
+class RequestTimer:
+    """Счётчики одного запроса: SQL-запросы и границы этапов."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.view = None
+        self.view_started = None
+        self.view_finished = None
+        self.view_db_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+    def start_view(self, view_name):
+        self.view = view_name
+        self.view_started = time.perf_counter()
+        self.view_db_time = self.db_time
+
+    def finish_view(self):
+        if self.view_started is None or self.view_finished is not None:
+            return
+        self.view_finished = time.perf_counter()
+        self.view_db_time = self.db_time - self.view_db_time
+
+    def get_metrics(self):
+        """Длительности этапов в миллисекундах."""
+        self.finish_view()
+        finished = time.perf_counter()
+        serialize = render = 0.0
+        if self.view_finished is not None:
+            serialize = (
+                self.view_finished - self.view_started - self.view_db_time
+            )
+            render = finished - self.view_finished
+        return {
+            'db': self.db_time * 1000,
+            'serialize': serialize * 1000,
+            'render': render * 1000,
+            'total': (finished - self.started) * 1000,
+        }
+
+
+class ServerTimingMiddleware:
+    """
+    Время SQL, сериализации и рендеринга в заголовке Server-Timing.
+
+    Включается настройкой SERVER_TIMING, иначе Django исключает
+    middleware из цепочки. SQL-запросы считаются через
+    connection.execute_wrapper. Сериализацией считается время работы
+    представления без SQL до finalize_response, после которого Django
+    вызывает process_template_response; рендерингом — время от этого
+    момента до готового ответа. У ответов без рендеринга, например
+    файлов, всё время представления без SQL относится к сериализации.
+    Те же значения пишутся в лог одной строкой JSON с именем
+    представления.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = request.server_timer = RequestTimer()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        metrics = timer.get_metrics()
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={duration:.1f}' + (
+                f';desc="{timer.queries} queries"' if name == 'db' else ''
+            )
+            for name, duration in metrics.items()
+        )
+        logger.info(json.dumps({
+            'view': timer.view,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': timer.queries,
+            **{
+                f'{name}_ms': round(duration, 2)
+                for name, duration in metrics.items()
+            },
+        }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.server_timer.start_view(
+            get_view_name(view_func, request.method)
+        )
+
+    def process_template_response(self, request, response):
+        request.server_timer.finish_view()
+        return response
+
+
+class ProfilerMiddleware:
+    """
+    Профилирование отдельного запроса через cProfile.
+
+    Включается настройкой PROFILING. Запрос профилируется, если в нём
+    есть заголовок X-Profile или параметр profile и пользователь,
+    определённый аутентификацией DRF, является сотрудником. Результат
+    сохраняется в PROFILE_ROOT в формате pstats, имя файла возвращается
+    в заголовке X-Profile. Одновременно профилируется только один
+    запрос процесса, остальные выполняются без профилировщика.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        if not self.is_requested(request) or not self.lock.acquire(
+            blocking=False
+        ):
+            return self.get_response(request)
+        try:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+            name = self.get_profile_name(request)
+            os.makedirs(settings.PROFILE_ROOT, exist_ok=True)
+            profiler.dump_stats(os.path.join(settings.PROFILE_ROOT, name))
+        finally:
+            self.lock.release()
+        response[PROFILE_RESPONSE_HEADER] = name
+        return response
+
+    def is_requested(self, request):
+        """Запрошено ли профилирование сотрудником."""
+        if not (
+            PROFILE_HEADER in request.META
+            or PROFILE_QUERY_PARAM in request.GET
+        ):
+            return False
+        try:
+            user = Request(request, authenticators=[
+                auth()
+                for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+            ]).user
+        except APIException:
+            return False
+        return user.is_staff
+
+    def get_profile_name(self, request):
+        """Имя файла профиля: время, метод и путь запроса."""
+        return '{}_{}_{}_{}{}'.format(
+            timezone.now().strftime('%Y%m%dT%H%M%S'),
+            request.method,
+            slugify(request.path.replace('/', ' ')) or 'root',
+            uuid.uuid4().hex[:8],
+            PROFILE_SUFFIX
+        )
@@ -0,0 +1,77 @@
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    Ответ 304 Not Modified на условные запросы чтения.
+
+    Валидаторы вычисляются до сериализации, поэтому при совпадении
+    If-None-Match или If-Modified-Since сериализаторы не вызываются.
+    """
+
+    def get_list_validators(self):
+        """Получение валидаторов списка: (etag, last_modified)."""
+        return None, None
+
+    def get_object_validators(self, instance):
+        """Получение валидаторов объекта: (etag, last_modified)."""
+        return None, None
+
+    def get_table_validators(self, queryset):
+        """Валидаторы таблицы по числу строк и последнему изменению."""
+        version = queryset.order_by().aggregate(
+            count=Count('id'),
+            last_modified=Max('updated_at')
+        )
+        last_modified = version['last_modified']
+        if last_modified is None:
+            return None, None
+        etag = (
+            f'{queryset.model._meta.model_name}-{version["count"]}-'
+            f'{last_modified.timestamp()}'
+        )
+        return etag, last_modified
+
+    def list(self, request, *args, **kwargs):
+        """Получение списка с учётом условных заголовков."""
+        etag, last_modified = self.get_list_validators()
+        return self.get_conditional_response(
+            etag,
+            last_modified,
+            lambda: super(ConditionalGetMixin, self).list(
+                request, *args, **kwargs
+            )
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """Получение объекта с учётом условных заголовков."""
+        instance = self.get_object()
+        etag, last_modified = self.get_object_validators(instance)
+        return self.get_conditional_response(
+            etag,
+            last_modified,
+            lambda: Response(self.get_serializer(instance).data)
+        )
+
+    def get_conditional_response(self, etag, last_modified, get_response):
+        """Ответ 304 при совпадении валидаторов, иначе полный ответ."""
+        if etag is not None:
+            etag = quote_etag(etag)
+        if last_modified is not None:
+            last_modified = int(last_modified.timestamp())
+        response = get_conditional_response(
+            self.request,
+            etag=etag,
+            last_modified=last_modified
+        )
+        if response is None:
+            response = get_response()
+        if etag is not None:
+            response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ('Authorization',))
+        return response
@@ -0,0 +1,50 @@
+import json
+
+from django.utils.datastructures import MultiValueDict
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import DataAndFiles, MultiPartParser
+
+JSON_FIELD = 'data'
+
+
+class JSONFormData(dict):
+    """
+    Данные из JSON-поля multipart-запроса.
+
+    DRF добавляет к данным загруженные файлы через update(), а словарь
+    без этого класса получил бы файлы списками из MultiValueDict.
+    """
+
+    def copy(self):
+        """Копия с сохранением класса."""
+        return type(self)(self)
+
+    def update(self, other):
+        """Добавление файлов по одному на поле."""
+        if isinstance(other, MultiValueDict):
+            other = other.dict()
+        super().update(other)
+
+
+class MultiPartJSONParser(MultiPartParser):
+    """
+    Разбор multipart/form-data с файлами, сохранёнными во временные файлы.
+
+    Вложенные данные (например, ингредиенты рецепта) передаются JSON-строкой
+    в поле data, файлы — отдельными частями запроса, которые не собираются
+    в памяти и не проходят через base64.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Объединение JSON из поля data с загруженными файлами."""
+        result = super().parse(stream, media_type, parser_context)
+        data = result.data.get(JSON_FIELD)
+        if data is None:
+            return result
+        try:
+            data = json.loads(data)
+        except ValueError as error:
+            raise ParseError(f'Поле data содержит неверный JSON: {error}')
+        if not isinstance(data, dict):
+            raise ParseError('Поле data должно содержать JSON-объект.')
+        return DataAndFiles(JSONFormData(data), result.files)
@@ -0,0 +1,40 @@
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+
+from foodgram_api.constants import HASH_CHUNK_SIZE
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Хранилище, называющее файлы по SHA-256 их содержимого.
+
+    Одинаковые загрузки получают одно имя и хранятся одним файлом,
+    поэтому файлы из хранилища удаляются только сборщиком мусора
+    delete_orphan_media, который проверяет ссылки на них.
+    """
+
+    def _save(self, name, content):
+        """
+        Сохранение файла под именем из хеша, если его ещё нет.
+
+        У повторно загруженного файла обновляется время изменения, чтобы
+        сборщик мусора не удалил его как давний файл без ссылок.
+        """
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        content.seek(0)
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        name = os.path.join(directory, digest.hexdigest() + extension)
+        if self.exists(name):
+            try:
+                os.utime(self.path(name))
+            except FileNotFoundError:
+                pass
+            else:
+                return name
+        return super()._save(name, content)
@@ -0,0 +1,33 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase
+
+from foodgram_api.storage import ContentAddressedStorage
+
+
+class ContentAddressedStorageTest(SimpleTestCase):
+    """Хранилище файлов по хешу содержимого."""
+
+    def setUp(self):
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location, ignore_errors=True)
+        self.storage = ContentAddressedStorage(location=self.location)
+
+    def test_same_content_same_name(self):
+        first = self.storage.save('images/a.png', ContentFile(b'image'))
+        second = self.storage.save('images/b.PNG', ContentFile(b'image'))
+        self.assertEqual(first, second)
+        self.assertTrue(first.endswith('.png'))
+
+    def test_reused_file_is_touched(self):
+        name = self.storage.save('images/a.png', ContentFile(b'image'))
+        os.utime(self.storage.path(name), (0, 0))
+        self.storage.save('images/b.png', ContentFile(b'image'))
+        self.assertGreater(
+            os.path.getmtime(self.storage.path(name)),
+            time.time() - 60
+        )
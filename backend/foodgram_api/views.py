@@ -0,0 +1,33 @@
+from django.http import FileResponse, Http404
+from django.utils.cache import patch_cache_control
+from PIL import UnidentifiedImageError
+
+from foodgram_api.constants import (
+    IMAGE_VARIANT_FORMATS,
+    IMAGE_VARIANT_MAX_AGE,
+    IMAGE_VARIANTS
+)
+from foodgram_api.images import create_variant, is_variant_source
+
+
+def image_variant(request, variant, name):
+    """
+    Отдача уменьшенной копии изображения с созданием при первом запросе.
+
+    Nginx отдаёт уже созданные копии сам и передаёт сюда только
+    запросы отсутствующих файлов.
+    """
+    name, _, extension = name.rpartition('.')
+    if (
+        variant not in IMAGE_VARIANTS
+        or extension not in IMAGE_VARIANT_FORMATS
+        or not is_variant_source(name)
+    ):
+        raise Http404
+    try:
+        path = create_variant(name, variant, extension)
+    except (OSError, UnidentifiedImageError):
+        raise Http404
+    response = FileResponse(path.open('rb'))
+    patch_cache_control(response, public=True, max_age=IMAGE_VARIANT_MAX_AGE)
+    return response
@@ -7,3 +7,7 @@ class RecipesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'recipes'
     verbose_name = "Рецепты"
+
+    def ready(self):
+        """Подключение обработчиков сигналов."""
+        import recipes.signals  # noqa: F401
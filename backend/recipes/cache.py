@@ -0,0 +1,95 @@
+from django.core.cache import cache
+
+from recipes.constants import (
+    RECIPE_CACHE_TIMEOUT,
+    RECIPE_CACHE_VERSION,
+    REFERENCE_CACHE_TIMEOUT
+)
+from recipes.models import Tag
+
+RECIPE_KEY = 'recipe:{}:{}'
+STATS_KEY = 'recipe-cache:{}'
+TAG_IDS_KEY = 'tag-ids-by-slug'
+
+
+def get_recipe_key(recipe):
+    """
+    Ключ кеша представления рецепта.
+
+    Ключ содержит дату изменения рецепта: любое изменение, влияющее на
+    представление, обновляет updated_at, поэтому представление, которое
+    параллельный запрос сохранит по прочитанной до изменения строке,
+    уже не совпадёт с ключом изменённого рецепта.
+    """
+    return RECIPE_KEY.format(recipe.id, recipe.updated_at.timestamp())
+
+
+def get_representations(recipes):
+    """Получение закешированных представлений рецептов по id рецепта."""
+    keys = {get_recipe_key(recipe): recipe.id for recipe in recipes}
+    found = cache.get_many(keys, version=RECIPE_CACHE_VERSION)
+    count('hits', len(found))
+    count('misses', len(keys) - len(found))
+    return {keys[key]: value for key, value in found.items()}
+
+
+def set_representations(recipes, representations):
+    """Сохранение в кеш представлений рецептов, заданных по id."""
+    cache.set_many(
+        {
+            get_recipe_key(recipe): representations[recipe.id]
+            for recipe in recipes
+        },
+        timeout=RECIPE_CACHE_TIMEOUT,
+        version=RECIPE_CACHE_VERSION
+    )
+
+
+def invalidate(keys):
+    """
+    Удаление представлений рецептов из кеша по ключам.
+
+    Только освобождает место: устаревшие представления и так не
+    совпадают с ключами изменённых рецептов.
+    """
+    if keys:
+        cache.delete_many(keys, version=RECIPE_CACHE_VERSION)
+
+
+def count(name, delta):
+    """Увеличение счётчика попаданий или промахов кеша."""
+    if not delta:
+        return
+    key = STATS_KEY.format(name)
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.set(key, delta, timeout=None)
+
+
+def get_stats():
+    """Получение счётчиков попаданий и промахов кеша."""
+    return {
+        name: cache.get(STATS_KEY.format(name), 0)
+        for name in ('hits', 'misses')
+    }
+
+
+def get_tag_ids_by_slug():
+    """
+    Получение словаря slug -> id тегов.
+
+    Словарь сбрасывается при изменении тегов, но с кешем в памяти
+    процесса сброс виден только этому процессу, поэтому словарь
+    хранится ограниченное время.
+    """
+    tag_ids = cache.get(TAG_IDS_KEY)
+    if tag_ids is None:
+        tag_ids = dict(Tag.objects.values_list('slug', 'id'))
+        cache.set(TAG_IDS_KEY, tag_ids, timeout=REFERENCE_CACHE_TIMEOUT)
+    return tag_ids
+
+
+def invalidate_tag_ids():
+    """Сброс словаря slug -> id тегов."""
+    cache.delete(TAG_IDS_KEY)
@@ -4,3 +4,11 @@ MESUREMENT_UNIT_MAX_LENGTH = 64
 NAME_MAX_LENGTH = 128
 RECIPE_MAX_LENGTH = 256
 SLUG_MAX_LENGTH = 32
+RECIPES_MAX_PAGE_SIZE = 100
+RECIPE_CACHE_TIMEOUT = 60 * 60 * 24
+RECIPE_CACHE_VERSION = 2
+REFERENCE_CACHE_TIMEOUT = 60 * 5
+INGREDIENT_SEARCH_LIMIT = 20
+AUTHOR_REPRESENTATION_FIELDS = frozenset(
+    ('username', 'first_name', 'last_name', 'email', 'avatar')
+)
@@ -1,15 +1,21 @@
 import django_filters
 from django.contrib import admin
 
-from recipes.models import Recipe, Tag
+from recipes.cache import get_tag_ids_by_slug
+from recipes.models import Recipe, Tag, TagRecipe
+
+
+def get_tag_choices():
+    """Получение вариантов фильтра по слагам тегов."""
+    return [(slug, slug) for slug in get_tag_ids_by_slug()]
 
 
 class RecipeFilter(django_filters.FilterSet):
     """Класс для фильтрации возвращаемого списка рецептов."""
 
     tags = django_filters.MultipleChoiceFilter(
-        field_name='tags__slug',
-        choices=Tag.objects.values_list('slug', 'slug')
+        choices=get_tag_choices,
+        method='filter_tags'
     )
     is_favorited = django_filters.NumberFilter(
         method='filter_is_favorited'
@@ -17,6 +23,13 @@ class RecipeFilter(django_filters.FilterSet):
     is_in_shopping_cart = django_filters.NumberFilter(
         method='filter_is_in_shopping_cart'
     )
+    ordering = django_filters.OrderingFilter(
+        fields=(
+            'pub_date',
+            'favorites_count',
+            'shopping_count'
+        )
+    )
 
     class Meta:
         """Дополнительные настроки фильтра."""
@@ -24,6 +37,13 @@ class RecipeFilter(django_filters.FilterSet):
         model = Recipe
         fields = ['author', 'tags']
 
+    def filter_tags(self, queryset, name, value):
+        """Фильтрация по слагам тегов через их id."""
+        tag_ids = get_tag_ids_by_slug()
+        return queryset.filter(id__in=TagRecipe.objects.filter(
+            tag_id__in=[tag_ids[slug] for slug in value if slug in tag_ids]
+        ).values('recipe_id'))
+
     def filter_is_favorited(self, queryset, name, value):
         """Фильтрация по избранному."""
         if value and self.request.user.is_authenticated:
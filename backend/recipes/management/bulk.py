@@ -0,0 +1,36 @@
+from contextlib import contextmanager
+
+from django.db import connection
+from django.db.models import Max
+
+
+def bulk_create_with_ids(model, objects, batch_size=None):
+    """
+    Пакетное создание объектов с заполненными первичными ключами.
+
+    PostgreSQL возвращает ключи из INSERT ... RETURNING, для SQLite они
+    назначаются подряд после максимального; вызывать внутри транзакции.
+    """
+    if not objects:
+        return objects
+    if not connection.features.can_return_rows_from_bulk_insert:
+        last_id = model.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+        for number, obj in enumerate(objects, start=last_id + 1):
+            obj.id = number
+    return model.objects.bulk_create(objects, batch_size=batch_size)
+
+
+@contextmanager
+def explicit_auto_now_add(model, field_name):
+    """
+    Сохранение переданных значений поля auto_now_add при bulk_create.
+
+    Меняет поле модели на время блока, поэтому подходит только
+    для management-команд, а не для кода, работающего в потоках сервера.
+    """
+    field = model._meta.get_field(field_name)
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
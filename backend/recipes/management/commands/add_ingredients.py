@@ -1,32 +1,16 @@
-import csv
-import os
-
-from django.conf import settings
-from django.core.management.base import BaseCommand
-from tqdm import tqdm
-
-from recipes.management.commands.constants import PATH
+from recipes.management.loaders import BaseLoadCommand
 from recipes.models import Ingredient
+from recipes.search import ingredient_index
 
 
-class Command(BaseCommand):
+class Command(BaseLoadCommand):
     """Добавление ингредиентов в базу данных."""
 
-    def handle(self, *args, **options):
-        csv_path = os.path.join(
-            settings.BASE_DIR,
-            PATH,
-            'ingredients.csv'
-        )
-        csv_file = open(csv_path, 'r', encoding='utf-8')
-        total_lines = sum(1 for _ in csv.reader(csv_file, delimiter=','))
-        csv_file = open(csv_path, 'r', encoding='utf-8')
-        csv_reader = csv.reader(csv_file, delimiter=',')
-        for row in tqdm(csv_reader, total=total_lines, ncols=80):
-            ingredient, created = Ingredient.objects.get_or_create(
-                name=row[0],
-                measurement_unit=row[1]
-            )
-        self.stdout.write(
-            self.style.SUCCESS('Ингредиенты добавлены в базу данных')
-        )
+    model = Ingredient
+    fields = ('name', 'measurement_unit')
+    filename = 'ingredients.csv'
+    success_message = 'Ингредиенты добавлены в базу данных'
+
+    def invalidate(self):
+        """Перестроение индекса поиска ингредиентов."""
+        ingredient_index.invalidate()
@@ -0,0 +1,300 @@
+import base64
+import io
+import json
+import math
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from favorites.models import Favorite
+from recipes.management.commands.constants import (
+    BENCHMARK_API_BASELINE,
+    BENCHMARK_API_OUTPUT,
+    BENCHMARK_API_RECIPES,
+    BENCHMARK_API_REPEAT,
+    BENCHMARK_API_TOLERANCE,
+    BENCHMARK_API_USERS
+)
+from recipes.models import Ingredient, Recipe, Tag
+from shopping_list.models import ShoppingList
+from subscriptions.models import Follow
+
+
+def percentile(values, share):
+    """Значение, которое не превышает доля share отсортированных значений."""
+    values = sorted(values)
+    return values[max(math.ceil(share * len(values)) - 1, 0)]
+
+
+class Command(BaseCommand):
+    """
+    Замер времени, количества запросов и памяти основных эндпоинтов API.
+
+    Запросы проходят через настоящие маршруты тестовым клиентом Django
+    на данных generate_fake_data, созданных во временной транзакции.
+    Результаты пишутся в JSON и сравниваются с сохранённым базовым
+    замером: рост p50 больше допуска или рост числа запросов считается
+    регрессией.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=BENCHMARK_API_USERS,
+            help='Количество пользователей в тестовых данных.'
+        )
+        parser.add_argument(
+            '--recipes',
+            type=int,
+            default=BENCHMARK_API_RECIPES,
+            help='Количество рецептов в тестовых данных.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=BENCHMARK_API_REPEAT,
+            help='Количество замеров каждого эндпоинта.'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--output',
+            default=BENCHMARK_API_OUTPUT,
+            help='Файл для результатов в JSON.'
+        )
+        parser.add_argument(
+            '--baseline',
+            default=os.path.join(settings.BASE_DIR, BENCHMARK_API_BASELINE),
+            help='Файл базового замера для поиска регрессий, '
+                 'пустая строка отключает сравнение.'
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=BENCHMARK_API_TOLERANCE,
+            help='Допустимый относительный рост p50.'
+        )
+        parser.add_argument(
+            '--server-timing',
+            action='store_true',
+            help='Замер с включённым ServerTimingMiddleware.'
+        )
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as media_root, override_settings(
+            MEDIA_ROOT=media_root,
+            SHOPPING_LIST_CACHE_ROOT=f'{media_root}/shopping_lists',
+            SERVER_TIMING=options['server_timing']
+        ), transaction.atomic():
+            call_command(
+                'generate_fake_data',
+                users=options['users'],
+                recipes=options['recipes'],
+                favorites=options['recipes'] * 5,
+                shopping_lists=options['recipes'],
+                follows=options['users'] * 5,
+                seed=options['seed'],
+                stdout=io.StringIO()
+            )
+            self.prepare()
+            results = {
+                name: self.measure(options['repeat'], *calls)
+                for name, *calls in self.get_endpoints()
+            }
+            transaction.set_rollback(True)
+        report = {
+            'database': connection.vendor,
+            'users': options['users'],
+            'recipes': options['recipes'],
+            'repeat': options['repeat'],
+            'server_timing': options['server_timing'],
+            'results': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+        regressions = []
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as baseline:
+                baseline = json.load(baseline)
+            same_database = baseline['database'] == connection.vendor
+            if not same_database:
+                self.stdout.write(self.style.WARNING(
+                    f'Базовый замер сделан на {baseline["database"]}, '
+                    'сравнивается только число запросов.'
+                ))
+            regressions = self.compare(
+                baseline['results'],
+                results,
+                options['tolerance'] if same_database else None
+            )
+        for name, result in results.items():
+            line = (
+                f'{name:<32} p50 {result["p50_ms"]:8.1f} мс  '
+                f'p95 {result["p95_ms"]:8.1f} мс  '
+                f'запросов {result["queries"]:4}  '
+                f'память {result["memory_kib"]:8.0f} КиБ'
+            )
+            self.stdout.write(
+                self.style.ERROR(line) if name in regressions else line
+            )
+        if regressions:
+            raise CommandError(f'Регрессии: {", ".join(regressions)}')
+
+    def prepare(self):
+        """Клиент с токеном пользователя, у которого есть все виды данных."""
+        user = User.objects.create(
+            username='benchmark_api',
+            email='benchmark_api@example.com'
+        )
+        client = APIClient(SERVER_NAME='localhost')
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}'
+        )
+        popular = list(Recipe.objects.order_by('-favorites_count')[:10])
+        for recipe in popular[:5]:
+            Favorite.objects.create(user=user, recipe=recipe)
+            ShoppingList.objects.create(user=user, recipe=recipe)
+        for author_id in {recipe.author_id for recipe in popular}:
+            Follow.objects.create(user=user, following_id=author_id)
+        self.client = client
+        self.recipe = popular[-1]
+        self.payload = self.create_payload()
+        self.own_recipe_id = client.post(
+            '/api/recipes/',
+            self.payload,
+            format='json'
+        ).data['id']
+
+    def create_payload(self):
+        """Данные нового рецепта с изображением в base64."""
+        output = io.BytesIO()
+        Image.new('RGB', (64, 64), (200, 100, 50)).save(output, format='PNG')
+        return {
+            'name': 'Рецепт для замера',
+            'text': 'Описание',
+            'cooking_time': 10,
+            'image': 'data:image/png;base64,'
+            + base64.b64encode(output.getvalue()).decode(),
+            'tags': list(Tag.objects.values_list('id', flat=True)[:2]),
+            'ingredients': [
+                {'id': ingredient_id, 'amount': 10}
+                for ingredient_id in Ingredient.objects.values_list(
+                    'id', flat=True
+                )[:8]
+            ],
+        }
+
+    def get_endpoints(self):
+        """Эндпоинты: название, запрос, подготовка и уборка после запроса."""
+        client = self.client
+        payload = self.payload
+        recipe_url = f'/api/recipes/{self.recipe.id}/'
+        own_url = f'/api/recipes/{self.own_recipe_id}/'
+        slug = Tag.objects.values_list('slug', flat=True).first()
+        update = dict(payload, text='Изменённое описание')
+        del update['image']
+
+        def get(url):
+            return lambda: client.get(url)
+
+        def toggle(url):
+            return (
+                ('add', lambda: client.post(url), None,
+                 lambda: client.delete(url)),
+                ('remove', lambda: client.delete(url),
+                 lambda: client.post(url), None),
+            )
+
+        endpoints = [
+            ('recipes_list', get('/api/recipes/')),
+            ('recipes_list_tags', get(f'/api/recipes/?tags={slug}')),
+            ('recipes_list_author',
+             get(f'/api/recipes/?author={self.recipe.author_id}')),
+            ('recipes_list_is_favorited',
+             get('/api/recipes/?is_favorited=1')),
+            ('recipes_list_is_in_shopping_cart',
+             get('/api/recipes/?is_in_shopping_cart=1')),
+            ('recipes_list_ordering',
+             get('/api/recipes/?ordering=-favorites_count')),
+            ('recipe_detail', get(recipe_url)),
+            ('recipe_create',
+             lambda: client.post('/api/recipes/', payload, format='json')),
+            ('recipe_update',
+             lambda: client.patch(own_url, update, format='json')),
+            ('download_shopping_cart_pdf',
+             get('/api/recipes/download_shopping_cart/')),
+            ('download_shopping_cart_csv',
+             get('/api/recipes/download_shopping_cart/?format=csv')),
+            ('subscriptions',
+             get('/api/users/subscriptions/?recipes_limit=3')),
+            ('ingredients_search', get('/api/ingredients/?name=мол')),
+        ]
+        for action in ('favorite', 'shopping_cart'):
+            for suffix, *calls in toggle(f'{recipe_url}{action}/'):
+                endpoints.append((f'{action}_{suffix}', *calls))
+        return endpoints
+
+    def measure(self, repeat, call, setup=None, cleanup=None):
+        """p50, p95, максимум запросов и пик памяти одного эндпоинта."""
+        timings, queries = [], []
+        for number in range(repeat + 2):
+            if setup:
+                setup()
+            traced = number == repeat + 1
+            if traced:
+                tracemalloc.start()
+            with CaptureQueriesContext(connection) as context:
+                started = time.perf_counter()
+                response = call()
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                elapsed = time.perf_counter() - started
+            query_count = len(context)
+            if traced:
+                memory = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            if response.status_code >= 400:
+                raise CommandError(
+                    f'{response.request["PATH_INFO"]}: '
+                    f'{response.status_code} {getattr(response, "data", "")}'
+                )
+            if cleanup:
+                cleanup()
+            if 0 < number <= repeat:
+                timings.append(elapsed)
+                queries.append(query_count)
+        return {
+            'p50_ms': round(statistics.median(timings) * 1000, 2),
+            'p95_ms': round(percentile(timings, 0.95) * 1000, 2),
+            'queries': max(queries),
+            'memory_kib': round(memory / 1024, 1),
+        }
+
+    def compare(self, baseline, results, tolerance=None):
+        """
+        Эндпоинты, ставшие медленнее допуска или с ростом числа запросов.
+
+        Число запросов базового замера — бюджет эндпоинта. При tolerance
+        None время не сравнивается.
+        """
+        return [
+            name for name, result in results.items()
+            if name in baseline and (
+                result['queries'] > baseline[name]['queries']
+                or tolerance is not None and result['p50_ms']
+                > baseline[name]['p50_ms'] * (1 + tolerance)
+            )
+        ]
@@ -0,0 +1,122 @@
+import base64
+import io
+import math
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from PIL import Image
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import User
+from accounts.views import AvatarCreateDeleteViewSet
+from recipes.management.commands.constants import (
+    BENCHMARK_UPLOAD_REPEAT,
+    BENCHMARK_UPLOAD_SIZES
+)
+
+
+class Command(BaseCommand):
+    """
+    Сравнение пиковой памяти загрузки аватара в base64 и multipart.
+
+    Тело запроса собирается до начала замера, файлы сохраняются
+    во временную директорию, данные откатываются после замера.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=BENCHMARK_UPLOAD_SIZES,
+            help='Примерный размер изображения в КиБ.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=BENCHMARK_UPLOAD_REPEAT,
+            help='Количество загрузок для каждого размера и способа.'
+        )
+
+    def handle(self, *args, **options):
+        view = AvatarCreateDeleteViewSet.as_view()
+        with tempfile.TemporaryDirectory() as media_root, override_settings(
+            MEDIA_ROOT=media_root
+        ), transaction.atomic():
+            user = User.objects.create(
+                username='benchmark_upload',
+                email='benchmark_upload@example.com'
+            )
+            for size in options['sizes']:
+                image = self.create_image(size * 1024)
+                for name, data, request_format in (
+                    (
+                        'base64',
+                        {
+                            'avatar': 'data:image/png;base64,'
+                            + base64.b64encode(image).decode()
+                        },
+                        'json'
+                    ),
+                    (
+                        'multipart',
+                        {'avatar': io.BytesIO(image)},
+                        'multipart'
+                    ),
+                ):
+                    timings, peaks = self.measure(
+                        view,
+                        user,
+                        data,
+                        request_format,
+                        options['repeat']
+                    )
+                    self.stdout.write(
+                        f'{len(image) / 1024:.0f} КиБ, {name}: '
+                        f'p50 {statistics.median(timings) * 1000:.1f} мс, '
+                        f'пик памяти {max(peaks) / 1024:.0f} КиБ '
+                        f'({max(peaks) / len(image):.1f}x)'
+                    )
+            transaction.set_rollback(True)
+
+    def create_image(self, size):
+        """PNG из случайных пикселей, который почти не сжимается."""
+        side = int(math.sqrt(size / 3))
+        output = io.BytesIO()
+        Image.frombytes(
+            'RGB',
+            (side, side),
+            os.urandom(side * side * 3)
+        ).save(output, format='PNG', compress_level=0)
+        return output.getvalue()
+
+    def measure(self, view, user, data, request_format, repeat):
+        """Время и пиковая память каждой загрузки."""
+        factory = APIRequestFactory(SERVER_NAME='localhost')
+        timings, peaks = [], []
+        for _ in range(repeat):
+            if request_format == 'multipart':
+                data['avatar'].seek(0)
+                data['avatar'].name = 'avatar.png'
+            request = factory.put(
+                '/api/users/me/avatar/',
+                data,
+                format=request_format
+            )
+            force_authenticate(request, user=user)
+            tracemalloc.start()
+            started = time.perf_counter()
+            response = view(request)
+            timings.append(time.perf_counter() - started)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            request.close()
+            if response.status_code != 200:
+                self.stderr.write(str(response.data))
+        return timings, peaks
@@ -0,0 +1,64 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from recipes.constants import INGREDIENT_SEARCH_LIMIT
+from recipes.management.commands.constants import BENCHMARK_REPEAT
+from recipes.models import Ingredient
+from recipes.search import ingredient_index
+
+
+class Command(BaseCommand):
+    """Сравнение поиска ингредиентов по индексу в памяти и через ORM."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=BENCHMARK_REPEAT,
+            help='Количество поисковых запросов для каждого способа.'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        names = list(Ingredient.objects.values_list('name', flat=True))
+        if not names:
+            self.stderr.write('Нет ингредиентов: выполните add_ingredients.')
+            return
+        rng = random.Random(options['seed'])
+        queries = []
+        for _ in range(options['repeat']):
+            name = rng.choice(names)
+            start = rng.randrange(len(name))
+            queries.append(name[start:start + rng.randint(1, 4)])
+        ingredient_index.get_entries()
+        results = {
+            'index': self.measure(ingredient_index.search, queries),
+            'orm': self.measure(self.search_orm, queries),
+        }
+        for method, elapsed in results.items():
+            self.stdout.write(
+                f'{method}: {elapsed / len(queries) * 1e6:.1f} мкс/запрос'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Ускорение: {results["orm"] / results["index"]:.1f}x'
+        ))
+
+    def measure(self, search, queries):
+        """Суммарное время выполнения поисковых запросов."""
+        started = time.perf_counter()
+        for query in queries:
+            list(search(query))
+        return time.perf_counter() - started
+
+    def search_orm(self, query):
+        """Поиск с тем же ранжированием через ILIKE по таблице."""
+        return Ingredient.objects.filter(name__icontains=query).annotate(
+            is_prefix=Case(
+                When(Q(name__istartswith=query), then=Value(0)),
+                default=Value(1),
+                output_field=IntegerField()
+            )
+        ).order_by('is_prefix', 'name')[:INGREDIENT_SEARCH_LIMIT]
@@ -0,0 +1,140 @@
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import User
+from recipes.management.commands.constants import (
+    BENCHMARK_CART_FORMATS,
+    BENCHMARK_CART_REPEAT,
+    BENCHMARK_CART_SIZES
+)
+from recipes.models import Ingredient, IngredientRecipe, Recipe
+from recipes.views import RecipeViewSet
+from shopping_list.models import ShoppingList
+
+
+class Command(BaseCommand):
+    """
+    Замер скорости и пиковой памяти скачивания списка покупок.
+
+    Данные создаются во временной транзакции и откатываются после замера,
+    сохранённые документы пишутся во временную директорию. Первое
+    скачивание формирует документ (холодное), второе читает готовый
+    файл (тёплое), они выводятся отдельно.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=BENCHMARK_CART_SIZES,
+            help='Количество разных ингредиентов в списке покупок.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=BENCHMARK_CART_REPEAT,
+            help='Количество скачиваний для каждого размера.'
+        )
+        parser.add_argument(
+            '--formats',
+            nargs='+',
+            default=BENCHMARK_CART_FORMATS,
+            help='Значения параметра format запроса.'
+        )
+
+    def handle(self, *args, **options):
+        view = RecipeViewSet.as_view(
+            {'get': 'download_shopping_cart'},
+            **RecipeViewSet.download_shopping_cart.kwargs
+        )
+        with tempfile.TemporaryDirectory() as cache_root, override_settings(
+            SHOPPING_LIST_CACHE_ROOT=cache_root
+        ):
+            for size in options['sizes']:
+                with transaction.atomic():
+                    user = self.create_cart(size)
+                    for document_format in options['formats']:
+                        self.report(size, document_format, self.measure(
+                            view,
+                            user,
+                            options['repeat'],
+                            document_format,
+                            cache_root
+                        ))
+                    transaction.set_rollback(True)
+
+    def report(self, size, document_format, result):
+        """Вывод холодных и тёплых замеров одного формата."""
+        cold = statistics.median(result['cold'])
+        warm = statistics.median(result['warm'])
+        self.stdout.write(
+            f'{size} ингредиентов, {document_format}: '
+            f'холодное p50 {cold * 1000:.1f} мс, '
+            f'max {max(result["cold"]) * 1000:.1f} мс, '
+            f'{size / cold:.0f} строк/с, '
+            f'пик памяти {max(result["peaks"]) / 1024:.0f} КиБ; '
+            f'тёплое p50 {warm * 1000:.1f} мс; '
+            f'размер {result["length"] / 1024:.0f} КиБ'
+        )
+
+    def create_cart(self, size):
+        """Создание пользователя со списком покупок из size ингредиентов."""
+        user = User.objects.create(
+            username='benchmark_cart',
+            email='benchmark_cart@example.com'
+        )
+        ingredients = Ingredient.objects.bulk_create(
+            Ingredient(
+                name=f'benchmark ингредиент {number}',
+                measurement_unit='г'
+            )
+            for number in range(size)
+        )
+        recipe = Recipe.objects.create(
+            author=user,
+            name='benchmark',
+            text='benchmark',
+            cooking_time=1,
+            image='images/benchmark.png'
+        )
+        IngredientRecipe.objects.bulk_create(
+            IngredientRecipe(ingredient=ingredient, recipe=recipe, amount=1)
+            for ingredient in Ingredient.objects.filter(
+                name__in=[ingredient.name for ingredient in ingredients]
+            )
+        )
+        ShoppingList.objects.create(user=user, recipe=recipe)
+        return user
+
+    def measure(self, view, user, repeat, document_format, cache_root):
+        """Время холодных и тёплых скачиваний, пик памяти и размер ответа."""
+        factory = APIRequestFactory()
+        result = {'cold': [], 'warm': [], 'peaks': [], 'length': 0}
+        for _ in range(repeat):
+            shutil.rmtree(cache_root, ignore_errors=True)
+            for timings in (result['cold'], result['warm']):
+                request = factory.get(
+                    '/api/recipes/download_shopping_cart/',
+                    {'format': document_format}
+                )
+                force_authenticate(request, user=user)
+                tracemalloc.start()
+                started = time.perf_counter()
+                response = view(request)
+                result['length'] = sum(len(chunk) for chunk in response)
+                timings.append(time.perf_counter() - started)
+                if timings is result['cold']:
+                    result['peaks'].append(
+                        tracemalloc.get_traced_memory()[1]
+                    )
+                tracemalloc.stop()
+        return result
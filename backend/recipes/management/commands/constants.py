@@ -1 +1,34 @@
 PATH = 'recipes/management/commands/'
+RECOUNT_BATCH_SIZE = 1000
+BENCHMARK_REPEAT = 200
+BENCHMARK_CART_SIZES = (10, 100, 1000)
+BENCHMARK_CART_REPEAT = 5
+BENCHMARK_CART_FORMATS = ('pdf', 'txt', 'csv', 'json')
+BENCHMARK_UPLOAD_SIZES = (1024, 4096, 8192)
+BENCHMARK_UPLOAD_REPEAT = 3
+MEDIA_GC_BATCH_SIZE = 500
+MEDIA_GC_MIN_AGE = 60 * 60
+MEDIA_GC_DIRECTORIES = ('images', 'avatars')
+LOAD_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 2000
+IMPORT_BATCH_SIZE = 1000
+FAKE_USERS = 1000
+FAKE_RECIPES = 10000
+FAKE_FAVORITES = 50000
+FAKE_SHOPPING_LISTS = 20000
+FAKE_FOLLOWS = 20000
+FAKE_INGREDIENTS_PER_RECIPE = 8
+FAKE_TAGS_PER_RECIPE = 2
+FAKE_MAX_AMOUNT = 500
+FAKE_MAX_COOKING_TIME = 180
+FAKE_PUB_DATE_DAYS = 365
+FAKE_SKEW = 1.1
+FAKE_BATCH_SIZE = 5000
+BENCHMARK_API_USERS = 200
+BENCHMARK_API_RECIPES = 2000
+BENCHMARK_API_REPEAT = 20
+BENCHMARK_API_TOLERANCE = 0.5
+BENCHMARK_API_OUTPUT = 'benchmark_api.json'
+PROFILES_SORT = 'cumulative'
+PROFILES_LIMIT = 30
+BENCHMARK_API_BASELINE = 'benchmarks/baseline.json'
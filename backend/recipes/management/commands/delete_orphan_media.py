@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.models import User
+from foodgram_api.constants import IMAGE_VARIANTS_DIR
+from recipes.management.commands.constants import (
+    MEDIA_GC_BATCH_SIZE,
+    MEDIA_GC_DIRECTORIES,
+    MEDIA_GC_MIN_AGE
+)
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    """
+    Удаление файлов media, на которые не ссылаются рецепты и пользователи.
+
+    Удаляются также уменьшенные копии удалённых изображений.
+    Недавние файлы пропускаются: их запись в БД может быть ещё
+    не завершена.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать файлы, которые будут удалены.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=MEDIA_GC_BATCH_SIZE,
+            help='Количество файлов, удаляемых за один проход.'
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=MEDIA_GC_MIN_AGE,
+            help='Минимальный возраст удаляемого файла в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        referenced = self.get_referenced()
+        threshold = timezone.now() - timedelta(seconds=options['min_age'])
+        batch = []
+        found = deleted = 0
+        for name, source in self.get_orphans(referenced):
+            if default_storage.get_modified_time(name) > threshold:
+                continue
+            found += 1
+            if options['dry_run']:
+                self.stdout.write(name)
+                continue
+            batch.append((name, source))
+            if len(batch) >= options['batch_size']:
+                deleted += self.delete(batch)
+                batch = []
+        deleted += self.delete(batch)
+        self.stdout.write(self.style.SUCCESS(
+            f'Найдено лишних файлов: {found}, удалено: {deleted}'
+        ))
+
+    def get_referenced(self, names=None):
+        """
+        Имена файлов, на которые ссылаются рецепты и пользователи.
+
+        Если передан names, проверяются только эти имена.
+        """
+        referenced = set()
+        recipes = Recipe.objects.values_list('image', flat=True)
+        users = User.objects.values_list('avatar', flat=True)
+        if names is not None:
+            recipes = recipes.filter(image__in=names)
+            users = users.filter(avatar__in=names)
+        for queryset in (recipes, users):
+            referenced.update(
+                name for name in queryset.order_by().iterator() if name
+            )
+        return referenced
+
+    def get_orphans(self, referenced):
+        """
+        Файлы и уменьшенные копии без ссылок на них.
+
+        Возвращает пары (имя файла, имя исходного изображения).
+        """
+        for directory in MEDIA_GC_DIRECTORIES:
+            for name in self.walk(directory):
+                if name not in referenced:
+                    yield name, name
+        for variant in self.listdir(IMAGE_VARIANTS_DIR)[0]:
+            prefix = f'{IMAGE_VARIANTS_DIR}/{variant}/'
+            for name in self.walk(prefix.rstrip('/')):
+                source = name[len(prefix):].rpartition('.')[0]
+                if source not in referenced:
+                    yield name, source
+
+    def walk(self, directory):
+        """Обход всех файлов директории хранилища."""
+        directories, files = self.listdir(directory)
+        for name in files:
+            yield f'{directory}/{name}'
+        for subdirectory in directories:
+            yield from self.walk(f'{directory}/{subdirectory}')
+
+    def listdir(self, directory):
+        """Содержимое директории хранилища, пустое если её нет."""
+        try:
+            return default_storage.listdir(directory)
+        except FileNotFoundError:
+            return [], []
+
+    def delete(self, batch):
+        """
+        Удаление пачки файлов.
+
+        Перед удалением ссылки проверяются заново: изображение могли
+        загрузить повторно после первого чтения ссылок.
+        """
+        referenced = self.get_referenced({source for _, source in batch})
+        deleted = 0
+        for name, source in batch:
+            if source in referenced:
+                continue
+            default_storage.delete(name)
+            deleted += 1
+        return deleted
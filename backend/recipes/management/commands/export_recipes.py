@@ -0,0 +1,97 @@
+import json
+import sys
+import time
+from collections import defaultdict
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+
+from recipes.management.commands.constants import EXPORT_CHUNK_SIZE
+from recipes.models import IngredientRecipe, Recipe, TagRecipe
+
+
+class Command(BaseCommand):
+    """
+    Выгрузка рецептов в NDJSON: одна строка JSON на рецепт.
+
+    Автор задаётся username, теги — slug, ингредиенты — названием
+    и единицей измерения, так что файл можно загрузить в другую базу
+    командой import_recipes. Файлы изображений не копируются.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default='-',
+            help='Файл для выгрузки, по умолчанию stdout.'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Количество рецептов, читаемых за один запрос.'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        output = (
+            sys.stdout if options['output'] == '-'
+            else open(options['output'], 'w', encoding='utf-8')
+        )
+        chunk_size = options['chunk_size']
+        recipes = Recipe.objects.select_related('author').order_by(
+            'id'
+        ).iterator(chunk_size=chunk_size)
+        total = 0
+        try:
+            while True:
+                chunk = list(islice(recipes, chunk_size))
+                if not chunk:
+                    break
+                for row in self.get_rows(chunk):
+                    output.write(json.dumps(row, ensure_ascii=False) + '\n')
+                total += len(chunk)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        elapsed = time.perf_counter() - started
+        self.stderr.write(self.style.SUCCESS(
+            f'Выгружено рецептов: {total} за {elapsed:.1f} с '
+            f'({total / elapsed:.0f} строк/с)'
+        ))
+
+    def get_rows(self, recipes):
+        """Строки NDJSON для пачки рецептов: два запроса на пачку."""
+        recipe_ids = [recipe.id for recipe in recipes]
+        ingredients = defaultdict(list)
+        for recipe_id, name, measurement_unit, amount in (
+            IngredientRecipe.objects.filter(
+                recipe_id__in=recipe_ids
+            ).order_by('id').values_list(
+                'recipe_id',
+                'ingredient__name',
+                'ingredient__measurement_unit',
+                'amount'
+            )
+        ):
+            ingredients[recipe_id].append({
+                'name': name,
+                'measurement_unit': measurement_unit,
+                'amount': amount
+            })
+        tags = defaultdict(list)
+        for recipe_id, slug in TagRecipe.objects.filter(
+            recipe_id__in=recipe_ids
+        ).order_by('id').values_list('recipe_id', 'tag__slug'):
+            tags[recipe_id].append(slug)
+        for recipe in recipes:
+            yield {
+                'author': recipe.author.username,
+                'name': recipe.name,
+                'text': recipe.text,
+                'image': recipe.image.name,
+                'cooking_time': recipe.cooking_time,
+                'pub_date': recipe.pub_date.isoformat(),
+                'tags': tags[recipe.id],
+                'ingredients': ingredients[recipe.id],
+            }
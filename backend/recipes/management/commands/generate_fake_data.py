@@ -0,0 +1,290 @@
+import io
+import random
+import time
+from array import array
+from datetime import timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image
+
+from accounts.models import User
+from favorites.models import Favorite
+from recipes.management.bulk import (
+    bulk_create_with_ids,
+    explicit_auto_now_add
+)
+from recipes.management.commands.constants import (
+    FAKE_BATCH_SIZE,
+    FAKE_FAVORITES,
+    FAKE_FOLLOWS,
+    FAKE_INGREDIENTS_PER_RECIPE,
+    FAKE_MAX_AMOUNT,
+    FAKE_MAX_COOKING_TIME,
+    FAKE_PUB_DATE_DAYS,
+    FAKE_RECIPES,
+    FAKE_SHOPPING_LISTS,
+    FAKE_SKEW,
+    FAKE_TAGS_PER_RECIPE,
+    FAKE_USERS
+)
+from recipes.models import Ingredient, IngredientRecipe, Recipe, Tag, TagRecipe
+from shopping_list.models import ShoppingList
+from subscriptions.models import Follow
+
+
+class PowerLawSampler:
+    """
+    Выбор элементов с вероятностью, убывающей как 1 / rank ** skew.
+
+    Ранги назначаются элементам случайно, чтобы популярные объекты
+    не совпадали с первыми id.
+    """
+
+    def __init__(self, items, skew, rng):
+        self.items = list(items)
+        rng.shuffle(self.items)
+        self.cum_weights = list(accumulate(
+            1 / rank ** skew for rank in range(1, len(self.items) + 1)
+        ))
+        self.rng = rng
+
+    def sample(self, count):
+        """Выбор count элементов с повторами."""
+        return self.rng.choices(
+            self.items,
+            cum_weights=self.cum_weights,
+            k=count
+        )
+
+    def sample_unique(self, count):
+        """Выбор до count разных элементов."""
+        return set(self.sample(count))
+
+
+class Command(BaseCommand):
+    """
+    Генерация пользователей, рецептов, избранного, списков покупок и подписок.
+
+    Популярность авторов, рецептов и ингредиентов подчиняется степенному
+    закону с показателем --skew. Данные добавляются пачками через
+    bulk_create, после чего пересчитываются счётчики и суммы списков
+    покупок. Работает с SQLite и PostgreSQL.
+    """
+
+    def add_arguments(self, parser):
+        for name, default, help_text in (
+            ('--users', FAKE_USERS, 'Количество пользователей.'),
+            ('--recipes', FAKE_RECIPES, 'Количество рецептов.'),
+            ('--favorites', FAKE_FAVORITES, 'Количество избранного.'),
+            ('--shopping-lists', FAKE_SHOPPING_LISTS,
+             'Количество рецептов в списках покупок.'),
+            ('--follows', FAKE_FOLLOWS, 'Количество подписок.'),
+            ('--ingredients-per-recipe', FAKE_INGREDIENTS_PER_RECIPE,
+             'Среднее количество ингредиентов в рецепте.'),
+            ('--tags-per-recipe', FAKE_TAGS_PER_RECIPE,
+             'Количество тегов в рецепте.'),
+            ('--batch-size', FAKE_BATCH_SIZE,
+             'Количество строк в одной транзакции.'),
+            ('--seed', 0, 'Начальное значение генератора случайных чисел.'),
+        ):
+            parser.add_argument(
+                name,
+                type=int,
+                default=default,
+                help=help_text
+            )
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=FAKE_SKEW,
+            help='Показатель степенного распределения популярности.'
+        )
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.skew = options['skew']
+        if not Ingredient.objects.exists():
+            call_command('add_ingredients', stdout=self.stdout)
+        if not Tag.objects.exists():
+            call_command('add_tags', stdout=self.stdout)
+        user_ids = self.timed('Пользователи', self.create_users,
+                              options['users'])
+        recipe_ids = self.timed(
+            'Рецепты',
+            self.create_recipes,
+            options['recipes'],
+            user_ids,
+            options['ingredients_per_recipe'],
+            options['tags_per_recipe']
+        )
+        recipes = PowerLawSampler(recipe_ids, self.skew, self.rng)
+        for title, model, count in (
+            ('Избранное', Favorite, options['favorites']),
+            ('Списки покупок', ShoppingList, options['shopping_lists']),
+        ):
+            self.timed(title, self.create_pairs, model, count, user_ids,
+                       recipes)
+        self.timed('Подписки', self.create_follows, options['follows'],
+                   user_ids)
+        self.timed('Счётчики', call_command, 'recount_recipe_counters',
+                   stdout=self.stdout)
+        self.timed('Суммы списков покупок', call_command,
+                   'rebuild_shopping_list_totals', stdout=self.stdout)
+
+    def timed(self, title, function, *args, **kwargs):
+        """Выполнение шага генерации с выводом времени."""
+        started = time.perf_counter()
+        result = function(*args, **kwargs)
+        self.stdout.write(self.style.SUCCESS(
+            f'{title}: {time.perf_counter() - started:.1f} с'
+        ))
+        return result
+
+    def batches(self, total):
+        """Размеры пачек для total строк."""
+        for start in range(0, total, self.batch_size):
+            yield min(self.batch_size, total - start)
+
+    def create_users(self, total):
+        """Создание пользователей с общим паролем password."""
+        password = make_password('password')
+        offset = User.objects.order_by('-id').values_list(
+            'id', flat=True
+        ).first() or 0
+        user_ids = array('q')
+        for size in self.batches(total):
+            first = offset + len(user_ids) + 1
+            users = [
+                User(
+                    username=f'fake{number}',
+                    email=f'fake{number}@example.com',
+                    first_name='Имя',
+                    last_name='Фамилия',
+                    password=password
+                )
+                for number in range(first, first + size)
+            ]
+            with transaction.atomic():
+                user_ids.extend(
+                    user.id for user in bulk_create_with_ids(User, users)
+                )
+        return user_ids
+
+    def create_recipes(self, total, user_ids, ingredients_per_recipe,
+                       tags_per_recipe):
+        """Создание рецептов с ингредиентами и тегами."""
+        authors = PowerLawSampler(user_ids, self.skew, self.rng)
+        ingredients = PowerLawSampler(
+            Ingredient.objects.values_list('id', flat=True),
+            self.skew,
+            self.rng
+        )
+        tag_ids = list(Tag.objects.values_list('id', flat=True))
+        tags_per_recipe = min(tags_per_recipe, len(tag_ids))
+        image = self.create_image()
+        now = timezone.now()
+        offset = Recipe.objects.order_by('-id').values_list(
+            'id', flat=True
+        ).first() or 0
+        recipe_ids = array('q')
+        for size in self.batches(total):
+            first = offset + len(recipe_ids) + 1
+            recipes = [
+                Recipe(
+                    author_id=author_id,
+                    name=f'Рецепт {first + number}',
+                    text='Описание рецепта.',
+                    image=image,
+                    cooking_time=self.rng.randint(1, FAKE_MAX_COOKING_TIME),
+                    pub_date=now - timedelta(seconds=self.rng.randrange(
+                        FAKE_PUB_DATE_DAYS * 24 * 60 * 60
+                    ))
+                )
+                for number, author_id in enumerate(authors.sample(size))
+            ]
+            with transaction.atomic(), explicit_auto_now_add(
+                Recipe,
+                'pub_date'
+            ):
+                bulk_create_with_ids(Recipe, recipes)
+                IngredientRecipe.objects.bulk_create([
+                    IngredientRecipe(
+                        recipe_id=recipe.id,
+                        ingredient_id=ingredient_id,
+                        amount=self.rng.randint(1, FAKE_MAX_AMOUNT)
+                    )
+                    for recipe in recipes
+                    for ingredient_id in ingredients.sample_unique(
+                        self.rng.randint(1, 2 * ingredients_per_recipe - 1)
+                    )
+                ])
+                TagRecipe.objects.bulk_create([
+                    TagRecipe(recipe_id=recipe.id, tag_id=tag_id)
+                    for recipe in recipes
+                    for tag_id in self.rng.sample(tag_ids, tags_per_recipe)
+                ])
+            recipe_ids.extend(recipe.id for recipe in recipes)
+        return recipe_ids
+
+    def create_image(self):
+        """Одно изображение для всех рецептов."""
+        output = io.BytesIO()
+        Image.new('RGB', (1, 1), (255, 255, 255)).save(output, format='PNG')
+        return default_storage.save(
+            'images/fake.png',
+            ContentFile(output.getvalue())
+        )
+
+    def create_pairs(self, model, total, user_ids, recipes):
+        """
+        Создание связей пользователей с популярными рецептами.
+
+        У моделей нет ограничения уникальности пары (пользователь, рецепт),
+        поэтому каждому пользователю выбирается набор разных рецептов,
+        как их допускает API. В памяти хранится только текущая пачка.
+        Популярные рецепты могут выпасть одному пользователю несколько
+        раз, поэтому связей бывает создано меньше total.
+        """
+        if not user_ids:
+            return
+        per_user, extra = divmod(total, len(user_ids))
+        created = 0
+        pairs = []
+        for number, user_id in enumerate(user_ids):
+            count = min(
+                per_user + (self.rng.random() < extra / len(user_ids)),
+                len(recipes.items)
+            )
+            pairs.extend(
+                model(user_id=user_id, recipe_id=recipe_id)
+                for recipe_id in recipes.sample_unique(count)
+            )
+            if len(pairs) >= self.batch_size or number == len(user_ids) - 1:
+                with transaction.atomic():
+                    model.objects.bulk_create(pairs)
+                created += len(pairs)
+                pairs = []
+        self.stdout.write(f'Создано связей: {created} из {total}')
+
+    def create_follows(self, total, user_ids):
+        """Создание подписок на популярных авторов."""
+        authors = PowerLawSampler(user_ids, self.skew, self.rng)
+        for size in self.batches(total):
+            follows = []
+            for following_id in authors.sample(size):
+                user_id = self.rng.choice(user_ids)
+                if user_id != following_id:
+                    follows.append(Follow(
+                        user_id=user_id,
+                        following_id=following_id
+                    ))
+            with transaction.atomic():
+                Follow.objects.bulk_create(follows, ignore_conflicts=True)
@@ -0,0 +1,129 @@
+import json
+import sys
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from accounts.models import User
+from recipes.management.bulk import (
+    bulk_create_with_ids,
+    explicit_auto_now_add
+)
+from recipes.management.commands.constants import IMPORT_BATCH_SIZE
+from recipes.models import (
+    Ingredient,
+    IngredientRecipe,
+    Recipe,
+    Tag,
+    TagRecipe
+)
+
+
+class Command(BaseCommand):
+    """
+    Загрузка рецептов из NDJSON, созданного командой export_recipes.
+
+    Каждая пачка добавляется в своей транзакции несколькими bulk_create.
+    Авторы, теги и ингредиенты должны уже существовать в базе.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Файл NDJSON или "-" для чтения из stdin.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Количество рецептов в одной транзакции.'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        self.tags = dict(Tag.objects.values_list('slug', 'id'))
+        self.ingredients = {
+            (name, measurement_unit): ingredient_id
+            for ingredient_id, name, measurement_unit in (
+                Ingredient.objects.values_list(
+                    'id', 'name', 'measurement_unit'
+                )
+            )
+        }
+        self.authors = {}
+        source = (
+            sys.stdin if options['path'] == '-'
+            else open(options['path'], encoding='utf-8')
+        )
+        total = 0
+        try:
+            lines = (line for line in source if line.strip())
+            while True:
+                batch = [
+                    json.loads(line)
+                    for line in islice(lines, options['batch_size'])
+                ]
+                if not batch:
+                    break
+                with transaction.atomic():
+                    self.save(batch)
+                total += len(batch)
+        except (KeyError, ValueError) as error:
+            raise CommandError(
+                f'Ошибка после {total} загруженных рецептов: {error!r}'
+            )
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено рецептов: {total} за {elapsed:.1f} с '
+            f'({total / elapsed:.0f} строк/с)'
+        ))
+
+    def get_author_ids(self, usernames):
+        """id авторов по username с запросом только новых имён."""
+        missing = set(usernames) - set(self.authors)
+        if missing:
+            self.authors.update(User.objects.filter(
+                username__in=missing
+            ).values_list('username', 'id'))
+        unknown = missing - set(self.authors)
+        if unknown:
+            raise KeyError(f'Нет пользователей: {", ".join(sorted(unknown))}')
+        return self.authors
+
+    def save(self, batch):
+        """Добавление пачки рецептов с ингредиентами и тегами."""
+        authors = self.get_author_ids(row['author'] for row in batch)
+        with explicit_auto_now_add(Recipe, 'pub_date'):
+            recipes = bulk_create_with_ids(Recipe, [
+                Recipe(
+                    author_id=authors[row['author']],
+                    name=row['name'],
+                    text=row['text'],
+                    image=row['image'],
+                    cooking_time=row['cooking_time'],
+                    pub_date=parse_datetime(row['pub_date'])
+                )
+                for row in batch
+            ])
+        IngredientRecipe.objects.bulk_create([
+            IngredientRecipe(
+                recipe_id=recipe.id,
+                ingredient_id=self.ingredients[
+                    (ingredient['name'], ingredient['measurement_unit'])
+                ],
+                amount=ingredient['amount']
+            )
+            for recipe, row in zip(recipes, batch)
+            for ingredient in row['ingredients']
+        ])
+        TagRecipe.objects.bulk_create([
+            TagRecipe(recipe_id=recipe.id, tag_id=self.tags[slug])
+            for recipe, row in zip(recipes, batch)
+            for slug in row['tags']
+        ])
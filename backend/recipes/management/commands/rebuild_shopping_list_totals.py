@@ -0,0 +1,116 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Sum
+
+from recipes.management.commands.constants import RECOUNT_BATCH_SIZE
+from recipes.models import IngredientRecipe
+from shopping_list.models import ShoppingList, ShoppingListIngredient
+
+
+class Command(BaseCommand):
+    """Проверка и пересборка сумм ингредиентов списков покупок."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только проверить суммы, не исправляя их.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RECOUNT_BATCH_SIZE,
+            help='Количество пользователей, обрабатываемых за один раз.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = 0
+        checked = broken = 0
+        while True:
+            batch = self.get_user_ids(last_id, batch_size)
+            if not batch:
+                break
+            last_id = batch[-1]
+            expected = self.get_expected(batch)
+            actual = self.get_actual(batch)
+            broken_batch = [
+                user_id for user_id in batch
+                if expected[user_id] != actual[user_id]
+            ]
+            if broken_batch and not options['check']:
+                self.rebuild(broken_batch, expected)
+            checked += len(batch)
+            broken += len(broken_batch)
+        if options['check'] and broken:
+            raise CommandError(
+                f'Расхождения у пользователей: {broken} из {checked}'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Проверено пользователей: {checked}, '
+            f'исправлено: {0 if options["check"] else broken}'
+        ))
+
+    def get_user_ids(self, last_id, batch_size):
+        """Следующие batch_size пользователей со списками или суммами."""
+        return list(
+            ShoppingList.objects.filter(user_id__gt=last_id).order_by(
+            ).values_list('user_id', flat=True).distinct().union(
+                ShoppingListIngredient.objects.filter(
+                    user_id__gt=last_id
+                ).order_by().values_list('user_id', flat=True).distinct()
+            ).order_by('user_id')[:batch_size]
+        )
+
+    def get_expected(self, user_ids):
+        """Суммы ингредиентов, посчитанные по спискам покупок."""
+        expected = defaultdict(dict)
+        for user_id, ingredient_id, total_amount in (
+            IngredientRecipe.objects.filter(
+                recipe__shopping_lists__user_id__in=user_ids
+            ).order_by().values(
+                'recipe__shopping_lists__user_id',
+                'ingredient_id'
+            ).annotate(
+                total_amount=Sum('amount')
+            ).values_list(
+                'recipe__shopping_lists__user_id',
+                'ingredient_id',
+                'total_amount'
+            )
+        ):
+            expected[user_id][ingredient_id] = total_amount
+        return expected
+
+    def get_actual(self, user_ids):
+        """Суммы ингредиентов, сохранённые в таблице."""
+        actual = defaultdict(dict)
+        for user_id, ingredient_id, total_amount in (
+            ShoppingListIngredient.objects.filter(
+                user_id__in=user_ids
+            ).order_by().values_list(
+                'user_id',
+                'ingredient_id',
+                'total_amount'
+            )
+        ):
+            actual[user_id][ingredient_id] = total_amount
+        return actual
+
+    def rebuild(self, user_ids, expected):
+        """Пересборка сумм ингредиентов пользователей."""
+        with transaction.atomic():
+            ShoppingListIngredient.objects.filter(
+                user_id__in=user_ids
+            ).delete()
+            ShoppingListIngredient.objects.bulk_create(
+                ShoppingListIngredient(
+                    user_id=user_id,
+                    ingredient_id=ingredient_id,
+                    total_amount=total_amount
+                )
+                for user_id in user_ids
+                for ingredient_id, total_amount in expected[user_id].items()
+            )
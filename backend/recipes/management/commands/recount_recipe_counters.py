@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from favorites.models import Favorite
+from recipes.management.commands.constants import RECOUNT_BATCH_SIZE
+from recipes.models import Recipe
+from shopping_list.models import ShoppingList
+
+COUNTERS = {
+    'favorites_count': Favorite,
+    'shopping_count': ShoppingList,
+}
+
+
+class Command(BaseCommand):
+    """Пересчёт счётчиков избранного и списков покупок рецептов."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RECOUNT_BATCH_SIZE,
+            help='Количество рецептов, обрабатываемых за один запрос.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = 0
+        checked = fixed = 0
+        while True:
+            recipes = list(
+                Recipe.objects.filter(id__gt=last_id).order_by('id').only(
+                    'id', *COUNTERS
+                )[:batch_size]
+            )
+            if not recipes:
+                break
+            last_id = recipes[-1].id
+            changed = self.recount(recipes)
+            if changed:
+                Recipe.objects.bulk_update(changed, list(COUNTERS))
+            checked += len(recipes)
+            fixed += len(changed)
+        self.stdout.write(self.style.SUCCESS(
+            f'Проверено рецептов: {checked}, исправлено: {fixed}'
+        ))
+
+    def recount(self, recipes):
+        """Получение рецептов с расхождением счётчиков."""
+        recipe_ids = [recipe.id for recipe in recipes]
+        totals = {
+            field: dict(
+                model.objects.filter(recipe_id__in=recipe_ids).order_by(
+                ).values('recipe_id').annotate(
+                    total=Count('id')
+                ).values_list('recipe_id', 'total')
+            )
+            for field, model in COUNTERS.items()
+        }
+        changed = []
+        for recipe in recipes:
+            counters = {
+                field: totals[field].get(recipe.id, 0) for field in COUNTERS
+            }
+            if any(
+                getattr(recipe, field) != value
+                for field, value in counters.items()
+            ):
+                for field, value in counters.items():
+                    setattr(recipe, field, value)
+                changed.append(recipe)
+        return changed
@@ -0,0 +1,102 @@
+import io
+import os
+import pstats
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from foodgram_api.constants import PROFILE_SUFFIX
+from recipes.management.commands.constants import (
+    PROFILES_LIMIT,
+    PROFILES_SORT
+)
+
+
+class Command(BaseCommand):
+    """
+    Список и сводка профилей запросов из PROFILE_ROOT.
+
+    Без аргументов выводит сохранённые профили от новых к старым.
+    С именами файлов выводит самые затратные функции; статистика
+    нескольких профилей суммируется.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names',
+            nargs='*',
+            help='Имена файлов профилей для сводки.'
+        )
+        parser.add_argument(
+            '--last',
+            action='store_true',
+            help='Сводка последнего сохранённого профиля.'
+        )
+        parser.add_argument(
+            '--sort',
+            default=PROFILES_SORT,
+            choices=[key.value for key in pstats.SortKey],
+            help='Порядок сортировки функций.'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=PROFILES_LIMIT,
+            help='Количество выводимых функций.'
+        )
+        parser.add_argument(
+            '--filter',
+            help='Регулярное выражение для отбора функций по пути и имени.'
+        )
+
+    def handle(self, *args, **options):
+        profiles = self.get_profiles()
+        names = options['names']
+        if options['last'] and profiles:
+            names = [profiles[0]]
+        if not names:
+            for name in profiles:
+                self.stdout.write(self.describe(name))
+            self.stdout.write(f'Профилей: {len(profiles)}')
+            return
+        missing = set(names) - set(profiles)
+        if missing:
+            raise CommandError(
+                f'Профили не найдены: {", ".join(sorted(missing))}'
+            )
+        output = io.StringIO()
+        stats = pstats.Stats(*map(self.get_path, names), stream=output)
+        restrictions = [options['limit']]
+        if options['filter']:
+            restrictions.insert(0, options['filter'])
+        stats.sort_stats(options['sort']).print_stats(*restrictions)
+        self.stdout.write(output.getvalue())
+
+    def get_path(self, name):
+        return os.path.join(settings.PROFILE_ROOT, name)
+
+    def get_profiles(self):
+        """Имена файлов профилей от новых к старым."""
+        if not os.path.isdir(settings.PROFILE_ROOT):
+            return []
+        return sorted(
+            (
+                name for name in os.listdir(settings.PROFILE_ROOT)
+                if name.endswith(PROFILE_SUFFIX)
+            ),
+            key=lambda name: os.path.getmtime(self.get_path(name)),
+            reverse=True
+        )
+
+    def describe(self, name):
+        """Строка списка: время, размер, число вызовов и общее время."""
+        path = self.get_path(name)
+        stats = pstats.Stats(path)
+        modified = datetime.fromtimestamp(os.path.getmtime(path))
+        return (
+            f'{modified:%Y-%m-%d %H:%M:%S}  {name}  '
+            f'{os.path.getsize(path) / 1024:8.1f} КиБ  '
+            f'вызовов {stats.total_calls:8}  '
+            f'{stats.total_tt * 1000:8.1f} мс'
+        )
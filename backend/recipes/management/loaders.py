@@ -0,0 +1,80 @@
+import csv
+import json
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from recipes.management.commands.constants import LOAD_BATCH_SIZE, PATH
+
+
+class BaseLoadCommand(BaseCommand):
+    """
+    Базовая команда загрузки справочника из CSV или JSON.
+
+    Файл читается один раз, строки добавляются пачками через
+    bulk_create(ignore_conflicts=True), так что повторный запуск
+    пропускает уже загруженные записи.
+    """
+
+    model = None
+    fields = ()
+    filename = None
+    success_message = None
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, PATH, self.filename),
+            help='Путь к файлу .csv или .json.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=LOAD_BATCH_SIZE,
+            help='Количество записей в одном запросе.'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        before = self.model.objects.count()
+        total = 0
+        batch = []
+        with transaction.atomic():
+            for row in self.read(options['path']):
+                batch.append(self.model(**row))
+                if len(batch) >= options['batch_size']:
+                    total += self.save(batch)
+                    batch = []
+            total += self.save(batch)
+        inserted = self.model.objects.count() - before
+        self.invalidate()
+        self.stdout.write(self.style.SUCCESS(
+            f'{self.success_message}: добавлено {inserted}, '
+            f'пропущено {total - inserted} '
+            f'за {time.perf_counter() - started:.2f} с'
+        ))
+
+    def read(self, path):
+        """Построчное чтение файла в словари полей модели."""
+        extension = os.path.splitext(path)[1].lower()
+        with open(path, encoding='utf-8') as file:
+            if extension == '.csv':
+                for row in csv.reader(file, skipinitialspace=True):
+                    if row:
+                        yield dict(zip(self.fields, row))
+            elif extension == '.json':
+                for row in json.load(file):
+                    yield {field: row[field] for field in self.fields}
+            else:
+                raise CommandError(f'Неподдерживаемый формат файла: {path}')
+
+    def save(self, batch):
+        """Добавление пачки записей без уже существующих."""
+        self.model.objects.bulk_create(batch, ignore_conflicts=True)
+        return len(batch)
+
+    def invalidate(self):
+        """Сброс кешей: bulk_create не отправляет сигналы post_save."""
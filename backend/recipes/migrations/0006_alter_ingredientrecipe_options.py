@@ -0,0 +1,17 @@
+# Generated by Django 3.2.3 on 2026-10-18 18:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_rename_description_recipe_text'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='ingredientrecipe',
+            options={'ordering': ('ingredient__name',)},
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import connection, models
+from django.db.models.functions import RowNumber
 from django.core.validators import MinValueValidator
 from django.urls import reverse
 
@@ -22,6 +23,10 @@ class NameIngredientTagModel(models.Model):
         unique=True,
         db_index=True
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
 
     class Meta:
         """Дополнительные настройки модели."""
@@ -70,6 +75,65 @@ class Tag(NameIngredientTagModel):
         verbose_name_plural = 'Теги'
 
 
+class RecipeQuerySet(models.QuerySet):
+    """Набор запросов для модели рецепта."""
+
+    def with_user_flags(self, user):
+        """Добавление признаков избранного и списка покупок для user."""
+        if not user.is_authenticated:
+            return self.annotate(
+                is_favorited=models.Value(
+                    False,
+                    output_field=models.BooleanField()
+                ),
+                is_in_shopping_cart=models.Value(
+                    False,
+                    output_field=models.BooleanField()
+                )
+            )
+        return self.annotate(
+            is_favorited=self._user_exists('favorites', user),
+            is_in_shopping_cart=self._user_exists('shopping_lists', user)
+        )
+
+    def latest_by_author(self, author_ids, limit=None):
+        """
+        Последние рецепты авторов, не больше limit рецептов на автора.
+
+        Ограничение считается одним запросом с ROW_NUMBER() по автору,
+        а при отсутствии оконных функций в БД — коррелированным
+        подзапросом.
+        """
+        queryset = self.filter(author_id__in=author_ids)
+        if limit is None:
+            return queryset.order_by('author_id', '-pub_date')
+        if not connection.features.supports_over_clause:
+            return queryset.filter(id__in=models.Subquery(
+                self.model.objects.filter(
+                    author_id=models.OuterRef('author_id')
+                ).order_by('-pub_date').values('id')[:limit]
+            )).order_by('author_id', '-pub_date')
+        ranked = queryset.order_by().annotate(recipe_rank=models.Window(
+            expression=RowNumber(),
+            partition_by=models.F('author_id'),
+            order_by=models.F('pub_date').desc()
+        ))
+        sql, params = ranked.query.sql_with_params()
+        return self.raw(
+            f'SELECT * FROM ({sql}) ranked '
+            'WHERE recipe_rank <= %s ORDER BY author_id, recipe_rank',
+            (*params, limit)
+        )
+
+    def _user_exists(self, related_name, user):
+        """Подзапрос EXISTS по связанной с рецептом модели пользователя."""
+        related_model = self.model._meta.get_field(related_name).related_model
+        return models.Exists(related_model.objects.filter(
+            user_id=user.id,
+            recipe_id=models.OuterRef('pk')
+        ))
+
+
 class Recipe(models.Model):
     """Модель рецепта."""
 
@@ -116,6 +180,21 @@ class Recipe(models.Model):
         auto_now_add=True,
         db_index=True
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
+    favorites_count = models.PositiveIntegerField(
+        'Количество добавлений в избранное',
+        default=0,
+        db_index=True
+    )
+    shopping_count = models.PositiveIntegerField(
+        'Количество добавлений в списки покупок',
+        default=0
+    )
+
+    objects = RecipeQuerySet.as_manager()
 
     class Meta:
         """Дополнительные настройки модели."""
@@ -124,6 +203,12 @@ class Recipe(models.Model):
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='recipe_pub_date_id_idx'
+            )
+        ]
 
     def __str__(self):
         """Возвращает название рецепта."""
@@ -138,7 +223,7 @@ class Recipe(models.Model):
 
     def get_favorites_count(self):
         """Возвращает количество добавлений в избранное."""
-        return self.favorites.count()
+        return self.favorites_count
 
 
 class IngredientRecipe(models.Model):
@@ -166,6 +251,11 @@ class IngredientRecipe(models.Model):
         }
     )
 
+    class Meta:
+        """Дополнительные настройки модели."""
+
+        ordering = ('ingredient__name',)
+
     def __str__(self):
         """Возвращает название ингредиента и рецепта."""
         return f'{self.ingredient} {self.recipe}'
@@ -0,0 +1,104 @@
+import base64
+import binascii
+from collections import OrderedDict
+
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from recipes.constants import RECIPES_MAX_PAGE_SIZE
+
+
+class RecipePaginator(Paginator):
+    """
+    Пагинатор рецептов.
+
+    COUNT(*) считается по id без аннотаций: признаки пользователя
+    вычисляются только для строк страницы, а не для всей таблицы.
+    """
+
+    @cached_property
+    def count(self):
+        """Общее количество рецептов."""
+        return self.object_list.values('pk').count()
+
+
+class RecipePagination(pagination.PageNumberPagination):
+    """
+    Пагинация рецептов.
+
+    По умолчанию постраничная, при наличии параметра cursor переходит
+    в режим курсора по (pub_date, id): следующая страница выбирается
+    условием по индексу, без COUNT(*) и OFFSET.
+    """
+
+    django_paginator_class = RecipePaginator
+    page_size_query_param = 'limit'
+    max_page_size = RECIPES_MAX_PAGE_SIZE
+    cursor_query_param = 'cursor'
+    ordering = ('-pub_date', '-id')
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Выбор режима пагинации и получение страницы."""
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+        self.request = request
+        self.display_page_controls = False
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params[self.cursor_query_param]
+        if cursor:
+            pub_date, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date)
+                | Q(pub_date=pub_date, pk__lt=pk)
+            )
+        results = list(queryset[:page_size + 1])
+        self.has_next = len(results) > page_size
+        self.cursor_page = results[:page_size]
+        return self.cursor_page
+
+    def get_paginated_response(self, data):
+        """Формирование ответа в зависимости от режима пагинации."""
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_cursor_link()),
+            ('results', data)
+        ]))
+
+    def get_next_cursor_link(self):
+        """Получение ссылки на следующую страницу в режиме курсора."""
+        if not self.has_next:
+            return None
+        last = self.cursor_page[-1]
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(last.pub_date, last.pk)
+        )
+
+    def encode_cursor(self, pub_date, pk):
+        """Кодирование позиции последнего рецепта страницы."""
+        position = f'{pub_date.isoformat()}|{pk}'
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        """Декодирование позиции из курсора."""
+        try:
+            position = base64.urlsafe_b64decode(cursor.encode()).decode()
+            pub_date, pk = position.split('|')
+            pub_date = parse_datetime(pub_date)
+            pk = int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return pub_date, pk
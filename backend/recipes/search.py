@@ -0,0 +1,109 @@
+import bisect
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+
+from recipes.constants import (
+    INGREDIENT_SEARCH_LIMIT,
+    REFERENCE_CACHE_TIMEOUT
+)
+from recipes.models import Ingredient
+
+INDEX_VERSION_KEY = 'ingredient-index-version'
+
+
+def normalize(text):
+    """Приведение строки к виду для поиска без учёта регистра."""
+    return text.casefold().replace('ё', 'е').strip()
+
+
+class IngredientIndex:
+    """
+    Индекс ингредиентов в памяти процесса.
+
+    Строится лениво при первом поиске и перестраивается, когда версия
+    индекса в кеше меняется после изменения ингредиентов. С кешем
+    в памяти процесса новая версия видна только процессу, изменившему
+    ингредиенты, поэтому индекс перестраивается и по истечении
+    REFERENCE_CACHE_TIMEOUT.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.entries = None
+        self.built_at = None
+
+    def is_stale(self, version):
+        """Нужно ли перестроить индекс."""
+        return (
+            self.entries is None
+            or self.version != version
+            or time.monotonic() - self.built_at > REFERENCE_CACHE_TIMEOUT
+        )
+
+    def get_entries(self):
+        """Получение построенного индекса."""
+        version = cache.get(INDEX_VERSION_KEY)
+        if self.is_stale(version):
+            with self.lock:
+                if self.is_stale(version):
+                    self.entries = self.build()
+                    self.version = version
+                    self.built_at = time.monotonic()
+        return self.entries
+
+    def build(self):
+        """Построение индекса по таблице ингредиентов."""
+        ingredients = sorted(
+            Ingredient.objects.only('id', 'name', 'measurement_unit'),
+            key=lambda ingredient: normalize(ingredient.name)
+        )
+        keys = [normalize(ingredient.name) for ingredient in ingredients]
+        starts = []
+        offset = 0
+        for key in keys:
+            starts.append(offset)
+            offset += len(key) + 1
+        return keys, starts, '\n'.join(keys), ingredients
+
+    def search(self, query, limit=INGREDIENT_SEARCH_LIMIT):
+        """
+        Поиск ингредиентов по названию.
+
+        Сначала идут совпадения по началу названия, затем по подстроке,
+        в каждой группе — в алфавитном порядке.
+        """
+        query = normalize(query)
+        keys, starts, text, ingredients = self.get_entries()
+        start = position = bisect.bisect_left(keys, query)
+        while (
+            position < len(keys)
+            and position - start < limit
+            and keys[position].startswith(query)
+        ):
+            position += 1
+        result = ingredients[start:position]
+        offset = 0
+        while len(result) < limit:
+            found = text.find(query, offset)
+            if found == -1:
+                break
+            index = bisect.bisect_right(starts, found) - 1
+            offset = starts[index] + len(keys[index]) + 1
+            if found != starts[index]:
+                result.append(ingredients[index])
+        return result
+
+    def invalidate(self):
+        """Смена версии индекса для перестроения во всех процессах."""
+        cache.set(
+            INDEX_VERSION_KEY,
+            uuid.uuid4().hex,
+            timeout=REFERENCE_CACHE_TIMEOUT
+        )
+
+
+ingredient_index = IngredientIndex()
@@ -1,8 +1,11 @@
-from django.shortcuts import get_object_or_404
+from django.db import transaction
+from django.db.models import Manager, Prefetch, prefetch_related_objects
 from rest_framework import serializers
 
 from accounts.serializers import UsersGetListSerializer
 from foodgram_api.fields import Base64ImageField
+from foodgram_api.images import get_variant_urls
+from recipes import cache as recipe_cache
 from recipes.constants import INGREDIENT_AMOUNT_MIN_VALUE
 from recipes.models import (
     Ingredient,
@@ -10,6 +13,8 @@ from recipes.models import (
     Recipe,
     Tag
 )
+from recipes.signals import bulk_recipe_change
+from shopping_list.totals import change_recipe_totals, change_rows_totals
 
 
 class IngredientSerializer(serializers.ModelSerializer):
@@ -18,26 +23,53 @@ class IngredientSerializer(serializers.ModelSerializer):
     class Meta:
         """Дополнительные настройки сериализатора."""
 
-        fields = '__all__'
+        fields = (
+            'id',
+            'name',
+            'measurement_unit'
+        )
         model = Ingredient
 
 
 class IngredientAmountSerializer(serializers.Serializer):
     """Сериализатор для ингридиентов с количеством."""
 
-    id = serializers.PrimaryKeyRelatedField(
-        queryset=Ingredient.objects.all()
-    )
+    id = serializers.IntegerField()
     amount = serializers.IntegerField()
 
 
+class IngredientRecipeReadSerializer(serializers.ModelSerializer):
+    """Сериализатор для чтения ингредиентов рецепта с количеством."""
+
+    id = serializers.ReadOnlyField(source='ingredient.id')
+    name = serializers.ReadOnlyField(source='ingredient.name')
+    measurement_unit = serializers.ReadOnlyField(
+        source='ingredient.measurement_unit'
+    )
+
+    class Meta:
+        """Дополнительные настройки сериализатора."""
+
+        fields = (
+            'id',
+            'name',
+            'measurement_unit',
+            'amount'
+        )
+        model = IngredientRecipe
+
+
 class TagSerializer(serializers.ModelSerializer):
     """Сериализатор для тегов."""
 
     class Meta:
         """Дополнительные настройки сериализатора."""
 
-        fields = '__all__'
+        fields = (
+            'id',
+            'name',
+            'slug'
+        )
         model = Tag
 
 
@@ -49,6 +81,7 @@ class BaseRecipeSerializer(serializers.ModelSerializer):
         'get_image_url',
         read_only=True,
     )
+    image_variants = serializers.SerializerMethodField()
 
     def get_image_url(self, obj):
         """Получение ссылки на изображение."""
@@ -56,6 +89,31 @@ class BaseRecipeSerializer(serializers.ModelSerializer):
             return obj.image.url
         return 'None'
 
+    def get_image_variants(self, obj):
+        """Получение ссылок на уменьшенные копии изображения."""
+        return get_variant_urls(obj.image)
+
+
+class RecipeListSerializer(serializers.ListSerializer):
+    """Сериализатор списка рецептов с кешированием представлений."""
+
+    def to_representation(self, data):
+        """Сборка списка из кеша с сериализацией только промахов."""
+        recipes = list(data.all() if isinstance(data, Manager) else data)
+        representations = recipe_cache.get_representations(recipes)
+        missing = [
+            recipe for recipe in recipes
+            if recipe.id not in representations
+        ]
+        if missing:
+            representations.update(
+                self.child.get_shared_representations(missing)
+            )
+        return [
+            self.child.add_live_fields(recipe, representations[recipe.id])
+            for recipe in recipes
+        ]
+
 
 class RecipeSerializer(BaseRecipeSerializer):
     """Сериализатор для модели рецепта."""
@@ -64,10 +122,7 @@ class RecipeSerializer(BaseRecipeSerializer):
         read_only=True,
         slug_field='username'
     )
-    tags = serializers.PrimaryKeyRelatedField(
-        many=True,
-        queryset=Tag.objects.all()
-    )
+    tags = serializers.ListField(child=serializers.IntegerField())
     ingredients = IngredientAmountSerializer(many=True)
     is_favorited = serializers.SerializerMethodField()
     is_in_shopping_cart = serializers.SerializerMethodField()
@@ -89,63 +144,81 @@ class RecipeSerializer(BaseRecipeSerializer):
             'is_favorited',
             'is_in_shopping_cart'
         )
-
-    def get_amount(self, recipe_id, ingredient):
-        """Получение количества ингредиента."""
-        return get_object_or_404(
-            IngredientRecipe,
-            ingredient=ingredient,
-            recipe_id=recipe_id
-        ).amount
+        list_serializer_class = RecipeListSerializer
 
     def get_is_favorited(self, obj):
         """Проверка: находится ли рецепт в избранном."""
+        is_favorited = getattr(obj, 'is_favorited', None)
+        if is_favorited is not None:
+            return is_favorited
         return obj.favorites.filter(
             user_id=self.context['request'].user.id
         ).exists()
 
     def get_is_in_shopping_cart(self, obj):
         """Проверка: находится ли рецепт в списке покупок."""
+        is_in_shopping_cart = getattr(obj, 'is_in_shopping_cart', None)
+        if is_in_shopping_cart is not None:
+            return is_in_shopping_cart
         return obj.shopping_lists.filter(
             user_id=self.context['request'].user.id
         ).exists()
 
     def validate(self, attrs):
-        """Проверка корректности данных для ингридиентов."""
+        """
+        Проверка корректности данных для ингридиентов и тегов.
+
+        Ингредиенты и теги загружаются одним запросом на каждую модель.
+        """
         ingredients = attrs.get('ingredients')
         if not ingredients:
             raise serializers.ValidationError('Отсутствуют ингредиенты!')
-        safe_ingredients = []
         for ingredient in ingredients:
-            current_ingredient = get_object_or_404(
-                Ingredient,
-                id=ingredient['id'].id
-            )
-            if current_ingredient in safe_ingredients:
-                raise serializers.ValidationError('Ингредиенты повторяются!')
-            safe_ingredients.append(current_ingredient)
-            if int(ingredient['amount']) < INGREDIENT_AMOUNT_MIN_VALUE:
+            if ingredient['amount'] < INGREDIENT_AMOUNT_MIN_VALUE:
                 raise serializers.ValidationError(
                     f'Количество ингредиента {ingredient} указано неверно!'
                 )
+        current_ingredients = self.get_objects(
+            Ingredient,
+            [ingredient['id'] for ingredient in ingredients],
+            'Ингредиенты повторяются!'
+        )
+        for ingredient, current_ingredient in zip(
+            ingredients,
+            current_ingredients
+        ):
+            ingredient['id'] = current_ingredient
         tags = attrs.get('tags')
         if not tags:
             raise serializers.ValidationError('Отсутствуют теги!')
-        if len(set(tags)) != len(tags):
-            raise serializers.ValidationError('Теги повторяются!')
+        attrs['tags'] = self.get_objects(Tag, tags, 'Теги повторяются!')
         return attrs
 
+    def get_objects(self, model, ids, duplicate_message):
+        """Загрузка объектов по списку id с проверкой повторов."""
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError(duplicate_message)
+        objects = model.objects.in_bulk(ids)
+        missing = [str(pk) for pk in ids if pk not in objects]
+        if missing:
+            raise serializers.ValidationError(
+                f'{model._meta.verbose_name_plural} с id '
+                f'{", ".join(missing)} не существуют!'
+            )
+        return [objects[pk] for pk in ids]
+
     def add_ingredients(self, ingredients, recipe):
         """Добавление и обновление ингредиентов рецепта в БД."""
         ingredient_recipes = [
             IngredientRecipe(
                 ingredient=ingredient['id'],
                 recipe=recipe,
-                amount=int(ingredient['amount'])
+                amount=ingredient['amount']
             )
             for ingredient in ingredients
         ]
         IngredientRecipe.objects.bulk_create(ingredient_recipes)
+        change_rows_totals(ingredient_recipes)
 
     def create(self, validated_data):
         """Добавление рецепта и связей с ним тегов и рецептов в БД."""
@@ -157,44 +230,111 @@ class RecipeSerializer(BaseRecipeSerializer):
         recipe.tags.set(tags)
         return recipe
 
+    def update_ingredients(self, ingredients, recipe):
+        """
+        Изменение только отличающихся ингредиентов рецепта.
+
+        Новые строки добавляются, изменённые количества обновляются,
+        удалённые строки удаляются внутри bulk_recipe_change, поэтому
+        обработчики post_delete не пересчитывают суммы по каждой строке.
+        Изменения всех строк, включая удалённые, попадают в списки
+        покупок одним вызовом change_recipe_totals; дату изменения
+        рецепта обновляет его сохранение в update.
+        """
+        current = {
+            ingredient_recipe.ingredient_id: ingredient_recipe
+            for ingredient_recipe in recipe.ingredientrecipe_set.order_by()
+        }
+        created, updated, amounts = [], [], {}
+        for ingredient in ingredients:
+            ingredient_recipe = current.pop(ingredient['id'].id, None)
+            if ingredient_recipe is None:
+                created.append(IngredientRecipe(
+                    ingredient=ingredient['id'],
+                    recipe=recipe,
+                    amount=ingredient['amount']
+                ))
+                amounts[ingredient['id'].id] = ingredient['amount']
+            elif ingredient_recipe.amount != ingredient['amount']:
+                amounts[ingredient['id'].id] = (
+                    ingredient['amount'] - ingredient_recipe.amount
+                )
+                ingredient_recipe.amount = ingredient['amount']
+                updated.append(ingredient_recipe)
+        for ingredient_id, ingredient_recipe in current.items():
+            amounts[ingredient_id] = -ingredient_recipe.amount
+        if current:
+            with bulk_recipe_change(recipe.id):
+                IngredientRecipe.objects.filter(
+                    id__in=[
+                        ingredient_recipe.id
+                        for ingredient_recipe in current.values()
+                    ]
+                ).delete()
+        IngredientRecipe.objects.bulk_create(created)
+        IngredientRecipe.objects.bulk_update(updated, ['amount'])
+        change_recipe_totals(recipe.id, amounts)
+
     def update(self, instance, validated_data):
         """Изменение рецепта и связей с ним тегов и рецептов в БД."""
-        instance.tags.clear()
-        instance.tags.set(validated_data.pop('tags'))
-        instance.ingredients.clear()
-        self.add_ingredients(validated_data.pop('ingredients'), instance)
-        return super().update(instance, validated_data)
-
-    def to_representation(self, instance):
-        """Изменение возвращаемых данных."""
-        representation = RecipeReadSerializer(instance).data
-        representation['author'] = UsersGetListSerializer(
-            instance.author,
-            context=self.context
-        ).data
-        representation['tags'] = TagSerializer(
-            instance.tags.all(),
-            many=True
-        ).data
-        representation['ingredients'] = IngredientSerializer(
-            instance.ingredients.all(),
-            many=True
-        ).data
-        for ingredient in representation['ingredients']:
-            ingredient['amount'] = self.get_amount(
-                representation['id'],
-                ingredient['id']
+        with transaction.atomic():
+            instance.tags.set(validated_data.pop('tags'))
+            self.update_ingredients(
+                validated_data.pop('ingredients'),
+                instance
             )
+            return super().update(instance, validated_data)
+
+    def get_shared_representations(self, recipes):
+        """Получение и кеширование представлений без данных пользователя."""
+        prefetch_related_objects(
+            recipes,
+            Prefetch(
+                'ingredientrecipe_set',
+                queryset=IngredientRecipe.objects.select_related('ingredient')
+            ),
+            'tags'
+        )
+        representations = {
+            recipe.id: RecipeReadSerializer(recipe, context=self.context).data
+            for recipe in recipes
+        }
+        recipe_cache.set_representations(recipes, representations)
+        return representations
+
+    def add_live_fields(self, instance, representation):
+        """Добавление в представление счётчиков и признаков пользователя."""
+        representation['favorites_count'] = instance.favorites_count
+        representation['shopping_count'] = instance.shopping_count
+        representation['author']['is_subscribed'] = UsersGetListSerializer(
+            context=self.context
+        ).get_is_subscribed(instance.author)
         representation['is_favorited'] = self.get_is_favorited(instance)
         representation['is_in_shopping_cart'] = (
             self.get_is_in_shopping_cart(instance)
         )
         return representation
 
+    def to_representation(self, instance):
+        """Изменение возвращаемых данных."""
+        representations = (
+            recipe_cache.get_representations([instance])
+            or self.get_shared_representations([instance])
+        )
+        return self.add_live_fields(instance, representations[instance.id])
+
 
 class RecipeReadSerializer(BaseRecipeSerializer):
     """Сериализатор для чтения модели рецепта."""
 
+    tags = TagSerializer(many=True, read_only=True)
+    author = UsersGetListSerializer(read_only=True)
+    ingredients = IngredientRecipeReadSerializer(
+        source='ingredientrecipe_set',
+        many=True,
+        read_only=True
+    )
+
     class Meta:
         """Дополнительные настроки сериализатора."""
 
@@ -206,6 +346,7 @@ class RecipeReadSerializer(BaseRecipeSerializer):
             'ingredients',
             'image',
             'image_url',
+            'image_variants',
             'name',
             'text',
             'cooking_time'
@@ -253,6 +394,7 @@ class RecipeWithoutIngredientsTagsSerializer(BaseRecipeSerializer):
             'name',
             'image',
             'image_url',
+            'image_variants',
             'cooking_time'
         )
 
@@ -0,0 +1,143 @@
+import threading
+from contextlib import contextmanager
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.models import User
+from recipes import cache as recipe_cache
+from recipes.constants import AUTHOR_REPRESENTATION_FIELDS
+from recipes.models import (
+    Ingredient,
+    IngredientRecipe,
+    Recipe,
+    Tag,
+    TagRecipe
+)
+from recipes.search import ingredient_index
+
+bulk_changes = threading.local()
+
+
+@contextmanager
+def bulk_recipe_change(recipe_id):
+    """
+    Пакетное изменение ингредиентов рецепта.
+
+    Обработчики удаления отдельных строк IngredientRecipe этого рецепта
+    внутри блока ничего не делают: дату изменения и суммы списков
+    покупок вызывающий код обновляет сам одним вызовом.
+    """
+    recipe_ids = getattr(bulk_changes, 'recipe_ids', set())
+    bulk_changes.recipe_ids = recipe_ids | {recipe_id}
+    try:
+        yield
+    finally:
+        bulk_changes.recipe_ids = recipe_ids
+
+
+def is_bulk_changed(recipe_id):
+    """Изменяется ли рецепт внутри bulk_recipe_change."""
+    return recipe_id in getattr(bulk_changes, 'recipe_ids', ())
+
+
+def touch_recipes(recipe_ids):
+    """
+    Обновление даты изменения рецептов.
+
+    Дата входит в ключ кеша представления, поэтому после фиксации
+    транзакции закешированные ранее представления больше не читаются.
+    """
+    recipe_ids = list(recipe_ids)
+    if not recipe_ids:
+        return
+    Recipe.objects.filter(id__in=recipe_ids).update(
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_delete, sender=Recipe)
+def invalidate_recipe(sender, instance, **kwargs):
+    """
+    Удаление из кеша представления удалённого рецепта.
+
+    Ключ вычисляется сразу: после удаления Django обнуляет id объекта.
+    """
+    transaction.on_commit(partial(
+        recipe_cache.invalidate,
+        [recipe_cache.get_recipe_key(instance)]
+    ))
+
+
+@receiver(post_save, sender=IngredientRecipe)
+@receiver(post_delete, sender=IngredientRecipe)
+@receiver(post_save, sender=TagRecipe)
+@receiver(post_delete, sender=TagRecipe)
+def invalidate_recipe_relation(sender, instance, **kwargs):
+    """Сброс кеша рецепта при изменении его ингредиентов или тегов."""
+    if not is_bulk_changed(instance.recipe_id):
+        touch_recipes([instance.recipe_id])
+
+
+@receiver(m2m_changed, sender=IngredientRecipe)
+@receiver(m2m_changed, sender=TagRecipe)
+def invalidate_recipe_m2m(sender, instance, action, reverse, pk_set,
+                          **kwargs):
+    """Сброс кеша рецептов при изменении связей через менеджеры."""
+    if not reverse:
+        if action.startswith('post_'):
+            touch_recipes([instance.id])
+    elif action in ('post_add', 'post_remove'):
+        touch_recipes(pk_set)
+    elif action == 'pre_clear':
+        touch_recipes(sender.objects.filter(
+            **{instance._meta.model_name: instance}
+        ).values_list('recipe_id', flat=True))
+
+
+@receiver(post_save, sender=Tag)
+def invalidate_tag(sender, instance, **kwargs):
+    """Сброс кеша рецептов с изменённым тегом."""
+    touch_recipes(TagRecipe.objects.filter(
+        tag=instance
+    ).values_list('recipe_id', flat=True))
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_ids(sender, **kwargs):
+    """Сброс словаря slug -> id тегов при изменении тегов."""
+    transaction.on_commit(recipe_cache.invalidate_tag_ids)
+
+
+@receiver(post_save, sender=Ingredient)
+def invalidate_ingredient(sender, instance, **kwargs):
+    """Сброс кеша рецептов с изменённым ингредиентом."""
+    touch_recipes(IngredientRecipe.objects.filter(
+        ingredient=instance
+    ).values_list('recipe_id', flat=True))
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def invalidate_ingredient_index(sender, **kwargs):
+    """Перестроение индекса поиска при изменении ингредиентов."""
+    transaction.on_commit(ingredient_index.invalidate)
+
+
+@receiver(post_save, sender=User)
+def invalidate_author(sender, instance, update_fields=None, **kwargs):
+    """
+    Сброс кеша рецептов автора при изменении его профиля.
+
+    Сохранение только полей, не входящих в представление автора,
+    например last_login при входе, кеш не сбрасывает.
+    """
+    if update_fields is not None and not (
+        AUTHOR_REPRESENTATION_FIELDS & set(update_fields)
+    ):
+        return
+    touch_recipes(instance.recipes.values_list('id', flat=True))
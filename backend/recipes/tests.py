@@ -0,0 +1,483 @@
+import base64
+import importlib
+import io
+import re
+import shutil
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import clear_url_caches, get_resolver
+from PIL import Image
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from recipes import cache as recipe_cache
+from recipes.constants import (
+    RECIPE_CACHE_VERSION,
+    REFERENCE_CACHE_TIMEOUT
+)
+from recipes.management.commands.delete_orphan_media import (
+    Command as DeleteOrphanMediaCommand
+)
+from recipes.models import Ingredient, IngredientRecipe, Recipe, Tag
+from recipes.search import IngredientIndex
+from favorites.models import Favorite
+from shopping_list.models import ShoppingList, ShoppingListIngredient
+
+RECIPES_URL = '/api/recipes/'
+
+
+class TempMediaMixin:
+    """Файлы, сохранённые тестами класса, пишутся во временный MEDIA_ROOT."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.media_settings = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.media_settings.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+
+
+class RecipeTestCase(TestCase):
+    """Базовый класс тестов рецептов с автором, тегами и ингредиентами."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username='user',
+            email='user@example.com'
+        )
+        cls.author = User.objects.create(
+            username='author',
+            email='author@example.com'
+        )
+        cls.token = Token.objects.create(user=cls.user)
+        cls.ingredients = [
+            Ingredient.objects.create(
+                name=f'Ингредиент {number}',
+                measurement_unit='г'
+            )
+            for number in range(60)
+        ]
+        cls.tags = [
+            Tag.objects.create(name=f'Тег {number}', slug=f'tag{number}')
+            for number in range(3)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    @classmethod
+    def create_recipes(cls, count, author=None, ingredients=5):
+        """Создание рецептов с ингредиентами и двумя тегами."""
+        recipes = []
+        for number in range(count):
+            recipe = Recipe.objects.create(
+                author=author or cls.author,
+                name=f'Рецепт {Recipe.objects.count() + 1}',
+                text='Описание',
+                cooking_time=10,
+                image='images/recipe.png'
+            )
+            IngredientRecipe.objects.bulk_create(
+                IngredientRecipe(
+                    recipe=recipe,
+                    ingredient=ingredient,
+                    amount=5
+                )
+                for ingredient in cls.ingredients[:ingredients]
+            )
+            recipe.tags.set(cls.tags[:2])
+            recipes.append(recipe)
+        return recipes
+
+
+class RecipeListQueriesTest(RecipeTestCase):
+    """Количество запросов списка рецептов не зависит от размера страницы."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.create_recipes(12)
+
+    def assert_list_queries(self, client, queries):
+        """Одинаковое число запросов для разных размеров страницы."""
+        for limit in (2, 6, 12):
+            with self.subTest(limit=limit):
+                cache.clear()
+                with self.assertNumQueries(queries):
+                    response = client.get(RECIPES_URL, {'limit': limit})
+                self.assertEqual(len(response.data['results']), limit)
+
+    def test_anonymous_list_queries(self):
+        self.assert_list_queries(APIClient(), 5)
+
+    def test_authenticated_list_queries(self):
+        self.assert_list_queries(self.client, 6)
+
+    def test_count_without_user_flags(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(RECIPES_URL)
+        self.assertEqual(response.data['count'], 12)
+        count_sql = next(
+            query['sql'] for query in context.captured_queries
+            if 'COUNT(' in query['sql']
+        )
+        self.assertNotIn('EXISTS', count_sql)
+
+
+class AuthorInvalidationTest(RecipeTestCase):
+    """Кеш рецептов автора сбрасывается только при изменении профиля."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.author.set_password('password')
+        cls.author.save()
+        cls.recipe, = cls.create_recipes(1)
+
+    def get_etag(self):
+        return self.client.get(f'{RECIPES_URL}{self.recipe.id}/')['ETag']
+
+    def test_login_keeps_etag(self):
+        etag = self.get_etag()
+        response = APIClient().post(
+            '/api/auth/token/login/',
+            {'email': self.author.email, 'password': 'password'}
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            f'{RECIPES_URL}{self.recipe.id}/',
+            HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_profile_change_resets_etag(self):
+        etag = self.get_etag()
+        self.author.first_name = 'Новое имя'
+        self.author.save(update_fields=['first_name'])
+        self.assertNotEqual(self.get_etag(), etag)
+
+
+class RecipeCacheInvalidationTest(RecipeTestCase):
+    """Представление, сохранённое по старой строке, не отдаётся."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.recipe, = cls.create_recipes(1)
+
+    def test_stale_representation_is_not_served(self):
+        url = f'{RECIPES_URL}{self.recipe.id}/'
+        stale = Recipe.objects.get(id=self.recipe.id)
+        self.recipe.name = 'Новое название'
+        self.recipe.save()
+        recipe_cache.set_representations(
+            [stale],
+            {stale.id: {'name': stale.name, 'author': {}}}
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.data['name'], 'Новое название')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_deleted_recipe_is_removed(self):
+        self.client.get(f'{RECIPES_URL}{self.recipe.id}/')
+        recipe = Recipe.objects.get(id=self.recipe.id)
+        key = recipe_cache.get_recipe_key(recipe)
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.delete()
+            self.assertIsNotNone(cache.get(key, version=RECIPE_CACHE_VERSION))
+        self.assertIsNone(cache.get(key, version=RECIPE_CACHE_VERSION))
+
+
+def forbid_queries(execute, sql, params, many, context):
+    """Обёртка execute_wrapper, запрещающая запросы к БД."""
+    raise AssertionError(f'Запрос к БД при запуске: {sql}')
+
+
+class StartupTest(RecipeTestCase):
+    """Запуск воркера без БД и фильтр по тегам, созданным после запуска."""
+
+    startup_modules = (
+        'recipes.filters',
+        'recipes.views',
+        'recipes.urls',
+        'foodgram_api.urls',
+        'foodgram.urls',
+        'foodgram.wsgi',
+    )
+
+    def test_startup_without_queries(self):
+        saved = {
+            name: sys.modules.pop(name, None)
+            for name in self.startup_modules
+        }
+        clear_url_caches()
+        try:
+            with connection.execute_wrapper(forbid_queries):
+                for name in self.startup_modules:
+                    importlib.import_module(name)
+                resolver = get_resolver('foodgram.urls')
+                resolver.resolve(RECIPES_URL)
+                resolver.resolve('/api/tags/')
+        finally:
+            for name, module in saved.items():
+                sys.modules.pop(name, None)
+                if module is not None:
+                    sys.modules[name] = module
+            clear_url_caches()
+
+    def test_tag_created_after_startup(self):
+        recipe, = self.create_recipes(1)
+        self.client.get(RECIPES_URL, {'tags': self.tags[0].slug})
+        with self.captureOnCommitCallbacks(execute=True):
+            tag = Tag.objects.create(name='Новый тег', slug='new')
+        recipe.tags.add(tag)
+        response = self.client.get(RECIPES_URL, {'tags': tag.slug})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [result['id'] for result in response.data['results']],
+            [recipe.id]
+        )
+
+
+class ReferenceCacheTimeoutTest(RecipeTestCase):
+    """Теги и ингредиенты, добавленные в другом процессе."""
+
+    def test_tag_ids_expire(self):
+        recipe_cache.get_tag_ids_by_slug()
+        Tag.objects.bulk_create([Tag(name='Новый тег', slug='new')])
+        self.assertNotIn('new', recipe_cache.get_tag_ids_by_slug())
+        expired = time.time() + REFERENCE_CACHE_TIMEOUT + 1
+        with mock.patch('time.time', return_value=expired):
+            self.assertIn('new', recipe_cache.get_tag_ids_by_slug())
+
+    def test_ingredient_index_expires(self):
+        index = IngredientIndex()
+        self.assertEqual(index.search('новый'), [])
+        Ingredient.objects.bulk_create([
+            Ingredient(name='Новый ингредиент', measurement_unit='г')
+        ])
+        self.assertEqual(index.search('новый'), [])
+        expired = time.monotonic() + REFERENCE_CACHE_TIMEOUT + 1
+        with mock.patch('time.monotonic', return_value=expired):
+            self.assertEqual(
+                [ingredient.name for ingredient in index.search('новый')],
+                ['Новый ингредиент']
+            )
+
+
+class ShoppingCartErrorTest(RecipeTestCase):
+    """Ошибки выгрузки списка покупок выводятся в JSON."""
+
+    url = f'{RECIPES_URL}download_shopping_cart/'
+
+    def test_anonymous_error_is_json(self):
+        for params, headers in (
+            ({}, {'HTTP_ACCEPT': 'application/pdf'}),
+            ({'format': 'csv'}, {}),
+        ):
+            with self.subTest(params=params, headers=headers):
+                response = APIClient().get(self.url, params, **headers)
+                self.assertEqual(response.status_code, 401)
+                self.assertEqual(response['Content-Type'], 'application/json')
+                self.assertIn('detail', response.json())
+
+    def test_unknown_format_is_json(self):
+        response = self.client.get(self.url, {'format': 'xls'})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+
+def create_image():
+    """Изображение рецепта в base64."""
+    output = io.BytesIO()
+    Image.new('RGB', (4, 4), (200, 100, 50)).save(output, format='PNG')
+    return (
+        'data:image/png;base64,'
+        + base64.b64encode(output.getvalue()).decode()
+    )
+
+
+class RecipeWriteTest(TempMediaMixin, RecipeTestCase):
+    """Проверка ингредиентов и тегов при создании и изменении рецепта."""
+
+    def get_payload(self, ingredients):
+        return {
+            'name': 'Рецепт',
+            'text': 'Описание',
+            'cooking_time': 10,
+            'image': create_image(),
+            'tags': [tag.id for tag in self.tags[:2]],
+            'ingredients': [
+                {'id': ingredient.id, 'amount': 10}
+                for ingredient in self.ingredients[:ingredients]
+            ],
+        }
+
+    def test_create_queries_do_not_grow(self):
+        for ingredients in (5, 50):
+            with self.subTest(ingredients=ingredients):
+                payload = self.get_payload(ingredients)
+                with self.assertNumQueries(16):
+                    response = self.client.post(
+                        RECIPES_URL, payload, format='json'
+                    )
+                self.assertEqual(response.status_code, 201, response.data)
+
+    def test_update_queries_do_not_grow(self):
+        for ingredients in (5, 50):
+            with self.subTest(ingredients=ingredients):
+                recipe_id = self.client.post(
+                    RECIPES_URL,
+                    self.get_payload(ingredients),
+                    format='json'
+                ).data['id']
+                payload = self.get_payload(ingredients)
+                del payload['image']
+                for ingredient in payload['ingredients']:
+                    ingredient['amount'] = 20
+                with self.assertNumQueries(14):
+                    response = self.client.patch(
+                        f'{RECIPES_URL}{recipe_id}/', payload, format='json'
+                    )
+                self.assertEqual(response.status_code, 200, response.data)
+                self.assertEqual(
+                    {item['amount'] for item in response.data['ingredients']},
+                    {20}
+                )
+
+    def test_invalid_ids(self):
+        payload = self.get_payload(2)
+        for field, value in (
+            ('ingredients', payload['ingredients'] * 2),
+            ('ingredients', [{'id': 10 ** 6, 'amount': 10}]),
+            ('tags', payload['tags'] * 2),
+            ('tags', [10 ** 6]),
+        ):
+            with self.subTest(field=field, value=value):
+                response = self.client.post(
+                    RECIPES_URL,
+                    dict(payload, **{field: value}),
+                    format='json'
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(Recipe.objects.exists())
+
+
+class RecipeIngredientsUpdateTest(RecipeTestCase):
+    """Удаление ингредиентов рецепта, который лежит в списках покупок."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.recipe, = cls.create_recipes(1, author=cls.user, ingredients=15)
+        for user in (cls.user, cls.author):
+            ShoppingList.objects.create(user=user, recipe=cls.recipe)
+
+    def update(self, ingredients):
+        return self.client.patch(
+            f'{RECIPES_URL}{self.recipe.id}/',
+            {
+                'name': self.recipe.name,
+                'text': 'Описание',
+                'cooking_time': 10,
+                'tags': [tag.id for tag in self.tags[:2]],
+                'ingredients': [
+                    {'id': ingredient.id, 'amount': 5}
+                    for ingredient in self.ingredients[:ingredients]
+                ],
+            },
+            format='json'
+        )
+
+    def test_remove_ingredients(self):
+        with self.assertNumQueries(19):
+            response = self.update(5)
+        self.assertEqual(response.status_code, 200, response.data)
+        for user in (self.user, self.author):
+            self.assertEqual(
+                sorted(ShoppingListIngredient.objects.filter(
+                    user=user
+                ).values_list('ingredient_id', 'total_amount')),
+                [(ingredient.id, 5) for ingredient in self.ingredients[:5]]
+            )
+
+
+class DeleteOrphanMediaTest(TempMediaMixin, RecipeTestCase):
+    """Сборщик файлов media без ссылок."""
+
+    def test_batch_is_checked_again(self):
+        referenced = default_storage.save(
+            'images/a.png',
+            ContentFile(b'referenced')
+        )
+        orphan = default_storage.save('images/b.png', ContentFile(b'orphan'))
+        recipe, = self.create_recipes(1)
+        Recipe.objects.filter(id=recipe.id).update(image=referenced)
+        deleted = DeleteOrphanMediaCommand().delete(
+            [(referenced, referenced), (orphan, orphan)]
+        )
+        self.assertEqual(deleted, 1)
+        self.assertTrue(default_storage.exists(referenced))
+        self.assertFalse(default_storage.exists(orphan))
+
+
+class GenerateFakeDataTest(TempMediaMixin, RecipeTestCase):
+    """Повторная генерация тестовых данных в заполненной БД."""
+
+    def test_repeated_runs(self):
+        output = io.StringIO()
+        for seed in (0, 1):
+            call_command(
+                'generate_fake_data',
+                users=5,
+                recipes=20,
+                favorites=200,
+                shopping_lists=200,
+                follows=10,
+                batch_size=50,
+                seed=seed,
+                stdout=output
+            )
+        self.assertFalse(
+            Recipe.objects.values('name').annotate(
+                count=Count('id')
+            ).filter(count__gt=1).exists()
+        )
+        for model in (Favorite, ShoppingList):
+            with self.subTest(model=model.__name__):
+                self.assertFalse(
+                    model.objects.values('user_id', 'recipe_id').annotate(
+                        count=Count('id')
+                    ).filter(count__gt=1).exists()
+                )
+        created = re.findall(
+            r'Создано связей: (\d+) из 200',
+            output.getvalue()
+        )
+        self.assertEqual(len(created), 4)
+        self.assertEqual(
+            sum(map(int, created)),
+            Favorite.objects.count() + ShoppingList.objects.count()
+        )
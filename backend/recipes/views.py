@@ -1,48 +1,56 @@
-import io
+import os
 
-from django.db.models import Sum
+from django.db import transaction
+from django.db.models import Prefetch
 from django.http import FileResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfgen import canvas
 from rest_framework import (
     permissions,
+    renderers,
     status,
     viewsets
 )
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from accounts.models import User
 from favorites.serializers import FavoriteSerializer
+from foodgram_api.mixins import ConditionalGetMixin
+from recipes.constants import RECIPE_CACHE_VERSION
 from recipes.filters import RecipeFilter
 from recipes.models import (
     Ingredient,
-    IngredientRecipe,
     Recipe,
     Tag
 )
+from recipes.pagination import RecipePagination
 from recipes.permissions import IsSafeMethodOrAuthor
+from recipes.search import ingredient_index
 from recipes.serializers import (
     IngredientSerializer,
     RecipeSerializer,
     RecipeShortUrlSerializer,
     TagSerializer
 )
-from shopping_list.constants import (
-    PDF_FILENAME,
-    PDF_MIN_PAGE_SIZE,
-    PDF_PAGE_NAME,
-    PDF_START_X,
-    PDF_START_Y,
-    PDF_STRING_SIZE
+from shopping_list.constants import EXPORT_FILENAME, JOB_RETRY_AFTER
+from shopping_list.documents import get_document
+from shopping_list.exports import EXPORTS
+from shopping_list.jobs import refresh_job, render_queue
+from shopping_list.renderers import (
+    CSVRenderer,
+    DocumentRenderer,
+    JSONDocumentRenderer,
+    PDFRenderer,
+    PlainTextRenderer
+)
+from shopping_list.serializers import (
+    ShoppingListJobSerializer,
+    ShoppingListSerializer
 )
-from shopping_list.serializers import ShoppingListSerializer
 
 
-class RecipeViewSet(viewsets.ModelViewSet):
+class RecipeViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Выполнение CRUD-операций с моделью Recipe."""
 
     queryset = Recipe.objects.all()
@@ -53,22 +61,121 @@ class RecipeViewSet(viewsets.ModelViewSet):
     )
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
+    pagination_class = RecipePagination
+
+    def get_queryset(self):
+        """Получение рецептов с признаками текущего пользователя."""
+        user = self.request.user
+        return Recipe.objects.with_user_flags(user).prefetch_related(
+            Prefetch(
+                'author',
+                queryset=User.objects.with_subscription_flag(user)
+            )
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """Вывод ошибок в JSON вместо согласованного формата документа."""
+        if isinstance(response, Response) and response.status_code >= 400:
+            renderer = getattr(request, 'accepted_renderer', None)
+            if renderer is None or isinstance(renderer, DocumentRenderer):
+                request.accepted_renderer = renderers.JSONRenderer()
+                request.accepted_media_type = (
+                    request.accepted_renderer.media_type
+                )
+        return super().finalize_response(request, response, *args, **kwargs)
 
-    @action(detail=False)
+    def get_object_validators(self, instance):
+        """
+        Валидаторы рецепта с учётом признаков текущего пользователя.
+
+        Last-Modified не отдаётся: признаки пользователя и счётчики
+        меняются без изменения самого рецепта.
+        """
+        flags = ''.join(str(int(flag)) for flag in (
+            instance.is_favorited,
+            instance.is_in_shopping_cart,
+            instance.author.is_subscribed
+        ))
+        etag = (
+            f'recipe-{instance.id}-{RECIPE_CACHE_VERSION}-'
+            f'{instance.updated_at.timestamp()}-{flags}-'
+            f'{instance.favorites_count}-{instance.shopping_count}'
+        )
+        return etag, None
+
+    @action(
+        detail=False,
+        permission_classes=(permissions.IsAuthenticated,),
+        renderer_classes=(
+            PDFRenderer,
+            PlainTextRenderer,
+            CSVRenderer,
+            JSONDocumentRenderer
+        )
+    )
     def download_shopping_cart(self, request, format=None):
-        """Получение списка покупок."""
-        buffer = io.BytesIO()
-        self.create_pdf(buffer)
-        buffer.seek(0)
-        response = FileResponse(
-            buffer,
-            content_type='application/pdf'
+        """Получение списка покупок в pdf, txt, csv или json."""
+        document_format = request.accepted_renderer.format
+        document = get_document(
+            list(self.get_ingredients()),
+            document_format
         )
-        response['Content-Disposition'] = (
-            f'attachment; filename="{PDF_FILENAME}"'
+        response = FileResponse(
+            document,
+            as_attachment=True,
+            filename=EXPORT_FILENAME.format(document_format),
+            content_type=EXPORTS[document_format][1]
         )
+        response['Content-Length'] = os.fstat(document.fileno()).st_size
         return response
 
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='download_shopping_cart/jobs',
+        permission_classes=(permissions.IsAuthenticated,)
+    )
+    def download_shopping_cart_jobs(self, request):
+        """Постановка формирования списка покупок в фоновую очередь."""
+        serializer = ShoppingListJobSerializer(
+            data=request.data,
+            context={'request': request}
+        )
+        serializer.is_valid(raise_exception=True)
+        job = render_queue.submit(
+            request.user,
+            list(self.get_ingredients()),
+            serializer.validated_data['document_format']
+        )
+        if job is None:
+            return Response(
+                {'detail': 'Очередь формирования списков покупок заполнена.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(JOB_RETRY_AFTER)}
+            )
+        serializer = ShoppingListJobSerializer(
+            job,
+            context={'request': request}
+        )
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+    @action(
+        detail=False,
+        url_path=r'download_shopping_cart/jobs/(?P<job_id>\d+)',
+        permission_classes=(permissions.IsAuthenticated,)
+    )
+    def download_shopping_cart_job(self, request, job_id=None):
+        """Получение состояния задачи формирования списка покупок."""
+        job = refresh_job(get_object_or_404(
+            request.user.shopping_list_jobs,
+            id=job_id
+        ))
+        serializer = ShoppingListJobSerializer(
+            job,
+            context={'request': request}
+        )
+        return Response(serializer.data)
+
     @action(detail=True, methods=['delete', 'post'])
     def favorite(self, request, pk=None):
         """Добавление и удаление рецепта, избранное."""
@@ -106,7 +213,8 @@ class RecipeViewSet(viewsets.ModelViewSet):
         data['recipe'] = get_object_or_404(Recipe, pk=recipe_id)
         serializer = serializer(data=data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            serializer.save()
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def delete_recipe(self, instance):
@@ -116,68 +224,60 @@ class RecipeViewSet(viewsets.ModelViewSet):
         self.perform_destroy(instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
-    def create_pdf(self, response):
-        """Создание списка покупок в pdf."""
-        page = canvas.Canvas(response, pagesize=letter)
-        pdfmetrics.registerFont(TTFont(
-            'DejaVuSans',
-            'recipes/fonts/djsans/DejaVuSans.ttf')
-        )
-        page.setFont('DejaVuSans', 12)
-        page.drawString(PDF_START_X, PDF_START_Y, PDF_PAGE_NAME)
-        ingredient_items = self.get_ingredients().items()
-        current_y = PDF_START_Y - PDF_STRING_SIZE
-        for ingredient in ingredient_items:
-            ingredient = (f'{str(ingredient[0])}: '
-                          f'{str(ingredient[1][0])} {str(ingredient[1][1])}')
-            if current_y < PDF_MIN_PAGE_SIZE:
-                page.showPage()
-                page.drawString(PDF_START_X, PDF_START_Y, PDF_PAGE_NAME)
-                current_y = PDF_START_Y
-            page.drawString(PDF_START_X, current_y, ingredient)
-            current_y -= PDF_STRING_SIZE
-        page.showPage()
-        page.save()
-
     def get_ingredients(self):
         """Получение ингредиентов."""
-        user = self.request.user
-        shopping_lists = user.shopping_lists.all()
-        recipes = Recipe.objects.filter(
-            shopping_lists__in=shopping_lists
-        )
-        queryset = IngredientRecipe.objects.filter(
-            recipe__in=recipes
-        ).values(
-            'ingredient_id',
+        queryset = self.request.user.shopping_list_ingredients.order_by(
+            'ingredient__name'
+        ).values_list(
             'ingredient__name',
+            'total_amount',
             'ingredient__measurement_unit'
-        ).annotate(
-            total_amount=Sum('amount')
-        ).order_by('ingredient__name')
-        ingredients_cart = {
-            item['ingredient__name']:
-            [item['total_amount'], item['ingredient__measurement_unit']]
-            for item in queryset
-        }
-        return ingredients_cart
-
-
-class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
+        )
+        return queryset
+
+
+class IngredientViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """Ответ на запрос ингредиента или списка ингредиентов."""
 
     permission_classes = (permissions.AllowAny,)
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
-    filter_backends = (DjangoFilterBackend,)
-    filterset_fields = ('name', )
     pagination_class = None
 
+    def filter_queryset(self, queryset):
+        """Поиск ингредиентов по названию через индекс в памяти."""
+        name = self.request.query_params.get('name')
+        if self.action == 'list' and name:
+            return ingredient_index.search(name)
+        return super().filter_queryset(queryset)
+
+    def get_list_validators(self):
+        """Валидаторы списка ингредиентов."""
+        return self.get_table_validators(Ingredient.objects.all())
+
+    def get_object_validators(self, instance):
+        """Валидаторы ингредиента."""
+        return (
+            f'ingredient-{instance.id}-{instance.updated_at.timestamp()}',
+            instance.updated_at
+        )
 
-class TagViewSet(viewsets.ReadOnlyModelViewSet):
+
+class TagViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """Ответ на запрос тега или списка тегов."""
 
     permission_classes = (permissions.AllowAny,)
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     pagination_class = None
+
+    def get_list_validators(self):
+        """Валидаторы списка тегов."""
+        return self.get_table_validators(Tag.objects.all())
+
+    def get_object_validators(self, instance):
+        """Валидаторы тега."""
+        return (
+            f'tag-{instance.id}-{instance.updated_at.timestamp()}',
+            instance.updated_at
+        )
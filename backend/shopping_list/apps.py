@@ -7,3 +7,7 @@ class ShoppingListConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'shopping_list'
     verbose_name = "Список покупок"
+
+    def ready(self):
+        """Подключение обработчиков сигналов."""
+        import shopping_list.signals  # noqa: F401
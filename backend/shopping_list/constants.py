@@ -1,6 +1,17 @@
-PDF_FILENAME = 'shopping_list.pdf'
 PDF_MIN_PAGE_SIZE = 40
 PDF_PAGE_NAME = 'Список покупок'
 PDF_START_X = 100
 PDF_START_Y = 750
 PDF_STRING_SIZE = 40
+PDF_FONT_NAME = 'DejaVuSans'
+PDF_FONT_PATH = 'recipes/fonts/djsans/DejaVuSans.ttf'
+PDF_FONT_SIZE = 12
+EXPORT_FILENAME = 'shopping_list.{}'
+CSV_HEADER = ('Ингредиент', 'Количество', 'Единица измерения')
+TEMPORARY_PREFIX = '.tmp'
+JOB_FORMAT_MAX_LENGTH = 8
+JOB_STATUS_MAX_LENGTH = 16
+JOB_DOCUMENT_MAX_LENGTH = 255
+JOB_RETRY_AFTER = 5
+JOB_TIMEOUT = 10 * 60
+JOB_MAX_AGE = 24 * 60 * 60
@@ -0,0 +1,129 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.utils.crypto import salted_hmac
+
+from shopping_list.constants import TEMPORARY_PREFIX
+from shopping_list.exports import EXPORTS
+
+
+def get_document_key(ingredients, document_format):
+    """
+    Ключ документа по содержимому списка покупок и формату.
+
+    Ключ подписан SECRET_KEY, так что по известному списку покупок
+    нельзя угадать имя файла в публичной директории media.
+    """
+    content = '\n'.join(
+        f'{name}\t{amount}\t{measurement_unit}'
+        for name, amount, measurement_unit in ingredients
+    )
+    return salted_hmac(
+        'shopping-list-document',
+        f'{document_format}\n{content}'
+    ).hexdigest()
+
+
+def get_cache_path(ingredients, document_format):
+    """Путь к файлу документа в SHOPPING_LIST_CACHE_ROOT."""
+    return Path(settings.SHOPPING_LIST_CACHE_ROOT) / (
+        f'{get_document_key(ingredients, document_format)}.{document_format}'
+    )
+
+
+def get_document(ingredients, document_format):
+    """
+    Открытый файл документа списка покупок.
+
+    Повторное скачивание неизменённого списка читает готовый файл,
+    новый документ формируется один раз и сохраняется на диск. Файл
+    открывается сразу, поэтому его удаление при вытеснении другим
+    запросом не мешает отдать уже открытый документ.
+    ingredients — список кортежей (название, количество, единица измерения).
+    """
+    path = get_cache_path(ingredients, document_format)
+    try:
+        document = open_document(path)
+    except FileNotFoundError:
+        return render_document(ingredients, document_format, path)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+    return document
+
+
+def open_document(path):
+    """
+    Открытие файла по дескриптору.
+
+    У такого файла нет имени, поэтому FileResponse не обращается
+    к пути, который может быть уже удалён при вытеснении.
+    """
+    return os.fdopen(os.open(path, os.O_RDONLY), 'rb')
+
+
+def get_document_path(ingredients, document_format):
+    """Путь к сформированному файлу документа списка покупок."""
+    get_document(ingredients, document_format).close()
+    return get_cache_path(ingredients, document_format)
+
+
+def render_document(ingredients, document_format, path):
+    """
+    Формирование документа во временный файл и перенос его в path.
+
+    Возвращает документ, открытый до переноса.
+    """
+    root = path.parent
+    root.mkdir(parents=True, exist_ok=True)
+    render = EXPORTS[document_format][0]
+    with tempfile.NamedTemporaryFile(
+        dir=root,
+        prefix=TEMPORARY_PREFIX,
+        delete=False
+    ) as output:
+        try:
+            render(ingredients, output)
+        except Exception:
+            os.unlink(output.name)
+            raise
+    document = open_document(output.name)
+    try:
+        os.replace(output.name, path)
+    except Exception:
+        document.close()
+        os.unlink(output.name)
+        raise
+    evict_documents(root, settings.SHOPPING_LIST_CACHE_MAX_SIZE, path)
+    return document
+
+
+def evict_documents(root, max_size, keep=None):
+    """
+    Удаление давно не скачанных документов сверх предельного размера.
+
+    Файл keep не удаляется, даже если он один больше предела.
+    """
+    documents = []
+    for entry in os.scandir(root):
+        if entry.name.startswith(TEMPORARY_PREFIX):
+            continue
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        documents.append((stat.st_mtime, stat.st_size, entry.path))
+    total_size = sum(size for _, size, _ in documents)
+    for _, size, path in sorted(documents):
+        if total_size <= max_size:
+            break
+        if path == str(keep):
+            continue
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total_size -= size
@@ -0,0 +1,60 @@
+import csv
+import json
+
+from shopping_list.constants import CSV_HEADER, PDF_PAGE_NAME
+from shopping_list.pdf import render_pdf
+
+
+class Echo:
+    """Буфер, возвращающий записанную строку вместо её хранения."""
+
+    def write(self, value):
+        """Возврат записанной строки."""
+        return value
+
+
+def iter_txt(ingredients):
+    """Построчная выдача списка покупок в текстовом виде."""
+    yield f'{PDF_PAGE_NAME}\n'
+    for name, amount, measurement_unit in ingredients:
+        yield f'{name}: {amount} {measurement_unit}\n'
+
+
+def iter_csv(ingredients):
+    """Построчная выдача списка покупок в csv."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_HEADER)
+    for row in ingredients:
+        yield writer.writerow(row)
+
+
+def iter_json(ingredients):
+    """Поэлементная выдача списка покупок в json."""
+    separator = '['
+    for name, amount, measurement_unit in ingredients:
+        yield separator + json.dumps(
+            {
+                'name': name,
+                'amount': amount,
+                'measurement_unit': measurement_unit
+            },
+            ensure_ascii=False
+        )
+        separator = ','
+    yield '[]' if separator == '[' else ']'
+
+
+def get_writer(export):
+    """Функция записи текстового формата в двоичный файл."""
+    def write(ingredients, output):
+        for chunk in export(ingredients):
+            output.write(chunk.encode())
+    return write
+
+
+EXPORTS = {
+    'pdf': (render_pdf, 'application/pdf'),
+    'txt': (get_writer(iter_txt), 'text/plain; charset=utf-8'),
+    'csv': (get_writer(iter_csv), 'text/csv; charset=utf-8'),
+    'json': (get_writer(iter_json), 'application/json'),
+}
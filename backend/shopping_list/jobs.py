@@ -0,0 +1,126 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.utils import timezone
+
+from shopping_list.constants import JOB_MAX_AGE, JOB_TIMEOUT
+from shopping_list.documents import get_document_path
+from shopping_list.models import ShoppingListJob
+
+logger = logging.getLogger(__name__)
+
+
+class RenderQueue:
+    """
+    Очередь фонового формирования документов в потоках процесса.
+
+    Одновременно выполняется не больше SHOPPING_LIST_JOB_WORKERS задач,
+    ещё SHOPPING_LIST_JOB_QUEUE_SIZE ждут в очереди. Внешний брокер
+    не нужен: состояние задач хранится в таблице ShoppingListJob.
+    Задачи, не завершённые за JOB_TIMEOUT, например из-за перезапуска
+    процесса, считаются ошибочными, задачи старше JOB_MAX_AGE удаляются.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.executor = None
+        self.slots = None
+
+    def start(self):
+        """Создание пула потоков при первой задаче."""
+        with self.lock:
+            if self.executor is None:
+                workers = settings.SHOPPING_LIST_JOB_WORKERS
+                self.slots = threading.BoundedSemaphore(
+                    workers + settings.SHOPPING_LIST_JOB_QUEUE_SIZE
+                )
+                self.executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix='shopping-list-job'
+                )
+
+    def submit(self, user, ingredients, document_format):
+        """
+        Создание задачи формирования документа.
+
+        Возвращает None, если очередь заполнена.
+        """
+        self.start()
+        expire_jobs()
+        if not self.slots.acquire(blocking=False):
+            return None
+        try:
+            job = ShoppingListJob.objects.create(
+                user=user,
+                document_format=document_format
+            )
+        except Exception:
+            self.slots.release()
+            raise
+        transaction.on_commit(lambda: self.executor.submit(
+            self.run,
+            job.id,
+            ingredients,
+            document_format
+        ))
+        return job
+
+    def run(self, job_id, ingredients, document_format):
+        """Формирование документа в потоке пула."""
+        jobs = ShoppingListJob.objects.filter(id=job_id)
+        try:
+            jobs.update(status=ShoppingListJob.Status.RUNNING)
+            path = get_document_path(ingredients, document_format)
+            jobs.update(
+                status=ShoppingListJob.Status.DONE,
+                document=os.path.relpath(path, settings.MEDIA_ROOT)
+            )
+        except Exception:
+            logger.exception('Shopping list job %s failed', job_id)
+            jobs.update(status=ShoppingListJob.Status.FAILED)
+        finally:
+            self.slots.release()
+            connections.close_all()
+
+
+def expire_jobs():
+    """Отметка зависших задач ошибкой и удаление старых задач."""
+    now = timezone.now()
+    ShoppingListJob.objects.filter(
+        status__in=(
+            ShoppingListJob.Status.PENDING,
+            ShoppingListJob.Status.RUNNING
+        ),
+        created_at__lt=now - timedelta(seconds=JOB_TIMEOUT)
+    ).update(status=ShoppingListJob.Status.FAILED)
+    ShoppingListJob.objects.filter(
+        created_at__lt=now - timedelta(seconds=JOB_MAX_AGE)
+    ).delete()
+
+
+def refresh_job(job):
+    """
+    Проверка состояния задачи перед выдачей клиенту.
+
+    Зависшая задача и готовая задача, документ которой уже вытеснен
+    из кеша, отмечаются ошибкой: клиент может поставить задачу заново.
+    """
+    if job.status == ShoppingListJob.Status.DONE:
+        stale = not default_storage.exists(job.document)
+    else:
+        stale = job.status != ShoppingListJob.Status.FAILED and (
+            job.created_at < timezone.now() - timedelta(seconds=JOB_TIMEOUT)
+        )
+    if stale:
+        job.status = ShoppingListJob.Status.FAILED
+        job.save(update_fields=['status'])
+    return job
+
+
+render_queue = RenderQueue()
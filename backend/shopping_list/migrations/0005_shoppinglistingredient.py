@@ -0,0 +1,58 @@
+# Generated by Django 3.2.3 on 2026-10-18 18:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Sum
+
+
+def fill_totals(apps, schema_editor):
+    IngredientRecipe = apps.get_model('recipes', 'IngredientRecipe')
+    ShoppingListIngredient = apps.get_model(
+        'shopping_list', 'ShoppingListIngredient'
+    )
+    ShoppingListIngredient.objects.bulk_create(
+        ShoppingListIngredient(
+            user_id=row['recipe__shopping_lists__user_id'],
+            ingredient_id=row['ingredient_id'],
+            total_amount=row['total_amount']
+        )
+        for row in IngredientRecipe.objects.filter(
+            recipe__shopping_lists__isnull=False
+        ).order_by().values(
+            'recipe__shopping_lists__user_id',
+            'ingredient_id'
+        ).annotate(total_amount=Sum('amount')).iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recipes', '0009_recipe_counters'),
+        ('shopping_list', '0004_alter_shoppinglist_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShoppingListIngredient',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_amount', models.PositiveIntegerField(verbose_name='Общее количество')),
+                ('ingredient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shopping_list_ingredients', to='recipes.ingredient', verbose_name='Ингредиент')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='shopping_list_ingredients', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'ингредиент списка покупок',
+                'verbose_name_plural': 'Ингредиенты списков покупок',
+                'ordering': ('ingredient__name',),
+                'default_related_name': 'shopping_list_ingredients',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='shoppinglistingredient',
+            constraint=models.UniqueConstraint(fields=('user', 'ingredient'), name='unique_shopping_list_ingredient'),
+        ),
+        migrations.RunPython(fill_totals, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,13 @@
+from django.db import models
+
+from accounts.models import User
 from favorites.models import BaseUserRecipeModel
+from recipes.models import Ingredient
+from shopping_list.constants import (
+    JOB_DOCUMENT_MAX_LENGTH,
+    JOB_FORMAT_MAX_LENGTH,
+    JOB_STATUS_MAX_LENGTH
+)
 
 
 class ShoppingList(BaseUserRecipeModel):
@@ -10,3 +19,91 @@ class ShoppingList(BaseUserRecipeModel):
         default_related_name = 'shopping_lists'
         verbose_name = 'список покупок'
         verbose_name_plural = 'Списки покупок'
+
+
+class ShoppingListIngredient(models.Model):
+    """Суммарное количество ингредиента в списке покупок пользователя."""
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='Пользователь'
+    )
+    ingredient = models.ForeignKey(
+        Ingredient,
+        on_delete=models.CASCADE,
+        verbose_name='Ингредиент'
+    )
+    total_amount = models.PositiveIntegerField(
+        verbose_name='Общее количество'
+    )
+
+    class Meta:
+        """Дополнительные настроки модели."""
+
+        default_related_name = 'shopping_list_ingredients'
+        verbose_name = 'ингредиент списка покупок'
+        verbose_name_plural = 'Ингредиенты списков покупок'
+        ordering = ('ingredient__name',)
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'ingredient'],
+                name='unique_shopping_list_ingredient'
+            )
+        ]
+
+    def __str__(self):
+        """Возвращает username пользователя и ингредиент."""
+        return f'{self.user.get_username()}: {self.ingredient}'
+
+
+class ShoppingListJob(models.Model):
+    """Фоновое формирование документа списка покупок."""
+
+    class Status(models.TextChoices):
+        """Состояния задачи."""
+
+        PENDING = 'pending', 'В очереди'
+        RUNNING = 'running', 'Выполняется'
+        DONE = 'done', 'Готово'
+        FAILED = 'failed', 'Ошибка'
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        verbose_name='Пользователь'
+    )
+    document_format = models.CharField(
+        max_length=JOB_FORMAT_MAX_LENGTH,
+        verbose_name='Формат'
+    )
+    status = models.CharField(
+        max_length=JOB_STATUS_MAX_LENGTH,
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name='Состояние'
+    )
+    document = models.CharField(
+        max_length=JOB_DOCUMENT_MAX_LENGTH,
+        blank=True,
+        verbose_name='Документ'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+
+    class Meta:
+        """Дополнительные настроки модели."""
+
+        default_related_name = 'shopping_list_jobs'
+        verbose_name = 'задача списка покупок'
+        verbose_name_plural = 'Задачи списков покупок'
+        ordering = ('-created_at',)
+
+    def __str__(self):
+        """Возвращает username пользователя, формат и состояние."""
+        return (
+            f'{self.user.get_username()}: '
+            f'{self.document_format} {self.status}'
+        )
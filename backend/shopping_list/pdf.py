@@ -0,0 +1,55 @@
+from functools import lru_cache
+
+from django.conf import settings
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from shopping_list.constants import (
+    PDF_FONT_NAME,
+    PDF_FONT_PATH,
+    PDF_FONT_SIZE,
+    PDF_MIN_PAGE_SIZE,
+    PDF_PAGE_NAME,
+    PDF_START_X,
+    PDF_START_Y,
+    PDF_STRING_SIZE
+)
+
+
+@lru_cache(maxsize=None)
+def register_font():
+    """Загрузка шрифта один раз на процесс."""
+    pdfmetrics.registerFont(TTFont(
+        PDF_FONT_NAME,
+        settings.BASE_DIR / PDF_FONT_PATH
+    ))
+
+
+def render_pdf(ingredients, output):
+    """
+    Запись списка покупок в pdf.
+
+    ingredients — итерируемый объект из кортежей
+    (название, количество, единица измерения).
+    """
+    register_font()
+    page = canvas.Canvas(output, pagesize=letter)
+    page.setFont(PDF_FONT_NAME, PDF_FONT_SIZE)
+    page.drawString(PDF_START_X, PDF_START_Y, PDF_PAGE_NAME)
+    current_y = PDF_START_Y - PDF_STRING_SIZE
+    for name, amount, measurement_unit in ingredients:
+        if current_y < PDF_MIN_PAGE_SIZE:
+            page.showPage()
+            page.setFont(PDF_FONT_NAME, PDF_FONT_SIZE)
+            page.drawString(PDF_START_X, PDF_START_Y, PDF_PAGE_NAME)
+            current_y = PDF_START_Y - PDF_STRING_SIZE
+        page.drawString(
+            PDF_START_X,
+            current_y,
+            f'{name}: {amount} {measurement_unit}'
+        )
+        current_y -= PDF_STRING_SIZE
+    page.showPage()
+    page.save()
@@ -0,0 +1,39 @@
+from rest_framework import renderers
+
+
+class DocumentRenderer(renderers.BaseRenderer):
+    """
+    Рендерер формата списка покупок.
+
+    Документ формирует представление, рендерер нужен только для выбора
+    формата по параметру format или заголовку Accept. Ошибки представление
+    выводит через JSONRenderer.
+    """
+
+
+class PDFRenderer(DocumentRenderer):
+    """Рендерер списка покупок в pdf."""
+
+    media_type = 'application/pdf'
+    format = 'pdf'
+
+
+class PlainTextRenderer(DocumentRenderer):
+    """Рендерер списка покупок в текст."""
+
+    media_type = 'text/plain'
+    format = 'txt'
+
+
+class CSVRenderer(DocumentRenderer):
+    """Рендерер списка покупок в csv."""
+
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class JSONDocumentRenderer(DocumentRenderer):
+    """Рендерер списка покупок в json."""
+
+    media_type = 'application/json'
+    format = 'json'
@@ -1,7 +1,9 @@
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 
 from favorites.serializers import BaseUserRecipeSerializer
-from shopping_list.models import ShoppingList
+from shopping_list.exports import EXPORTS
+from shopping_list.models import ShoppingList, ShoppingListJob
 
 
 class ShoppingListSerializer(BaseUserRecipeSerializer):
@@ -24,3 +26,29 @@ class ShoppingListSerializer(BaseUserRecipeSerializer):
                 'Рецепт уже был добавлен в список покупок!'
             )
         return data
+
+
+class ShoppingListJobSerializer(serializers.ModelSerializer):
+    """Сериализатор для задачи формирования списка покупок."""
+
+    format = serializers.ChoiceField(
+        choices=tuple(EXPORTS),
+        default='pdf',
+        source='document_format'
+    )
+    file = serializers.SerializerMethodField()
+
+    class Meta:
+        """Дополнительные настроки сериализатора."""
+
+        model = ShoppingListJob
+        fields = ('id', 'format', 'status', 'file', 'created_at')
+        read_only_fields = ('status', 'created_at')
+
+    def get_file(self, obj):
+        """Получение ссылки на готовый документ."""
+        if obj.status != ShoppingListJob.Status.DONE:
+            return None
+        return self.context['request'].build_absolute_uri(
+            default_storage.url(obj.document)
+        )
@@ -0,0 +1,92 @@
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save
+)
+from django.dispatch import receiver
+
+from favorites.signals import update_recipe_counter
+from recipes.models import IngredientRecipe
+from recipes.signals import is_bulk_changed
+from shopping_list.models import ShoppingList
+from shopping_list.totals import (
+    change_recipe_totals,
+    change_rows_totals,
+    change_totals,
+    get_recipe_amounts
+)
+
+
+@receiver(post_save, sender=ShoppingList)
+def add_to_shopping_list(sender, instance, created, **kwargs):
+    """Учёт рецепта, добавленного в список покупок."""
+    if created:
+        update_recipe_counter(instance.recipe_id, 'shopping_count', 1)
+        change_totals(
+            {instance.user_id: 1},
+            get_recipe_amounts(instance.recipe_id)
+        )
+
+
+@receiver(post_delete, sender=ShoppingList)
+def remove_from_shopping_list(sender, instance, **kwargs):
+    """Учёт рецепта, удалённого из списка покупок."""
+    update_recipe_counter(instance.recipe_id, 'shopping_count', -1)
+    change_totals(
+        {instance.user_id: 1},
+        get_recipe_amounts(instance.recipe_id, sign=-1)
+    )
+
+
+@receiver(pre_save, sender=IngredientRecipe)
+def remember_ingredient_recipe(sender, instance, **kwargs):
+    """Запоминание сохранённого состояния строки рецепта."""
+    instance.previous = None
+    if instance.pk and not instance._state.adding:
+        instance.previous = IngredientRecipe.objects.filter(
+            pk=instance.pk
+        ).first()
+
+
+@receiver(post_save, sender=IngredientRecipe)
+def change_ingredient_recipe(sender, instance, **kwargs):
+    """Учёт изменения ингредиента рецепта в списках покупок."""
+    previous = getattr(instance, 'previous', None)
+    if previous is not None:
+        change_rows_totals([previous], sign=-1)
+    change_rows_totals([instance])
+
+
+@receiver(post_delete, sender=IngredientRecipe)
+def delete_ingredient_recipe(sender, instance, **kwargs):
+    """Учёт удаления ингредиента рецепта из списков покупок."""
+    if is_bulk_changed(instance.recipe_id):
+        return
+    change_recipe_totals(
+        instance.recipe_id,
+        {instance.ingredient_id: -instance.amount}
+    )
+
+
+@receiver(m2m_changed, sender=IngredientRecipe)
+def add_recipe_ingredients(sender, instance, action, reverse, pk_set,
+                           **kwargs):
+    """
+    Учёт ингредиентов, добавленных через менеджеры связей.
+
+    Удаление через remove() и clear() учитывается обработчиком post_delete.
+    """
+    if action != 'post_add':
+        return
+    if reverse:
+        rows = IngredientRecipe.objects.filter(
+            ingredient=instance,
+            recipe_id__in=pk_set
+        )
+    else:
+        rows = IngredientRecipe.objects.filter(
+            recipe=instance,
+            ingredient_id__in=pk_set
+        )
+    change_rows_totals(rows.order_by())
@@ -0,0 +1,223 @@
+import io
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError
+from django.http import FileResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from recipes.models import Ingredient, IngredientRecipe, Recipe
+from shopping_list import totals
+from shopping_list.constants import JOB_MAX_AGE, JOB_TIMEOUT
+
+from shopping_list.documents import (
+    get_cache_path,
+    get_document,
+    get_document_path
+)
+from shopping_list.jobs import expire_jobs
+from shopping_list.models import (
+    ShoppingList,
+    ShoppingListIngredient,
+    ShoppingListJob
+)
+
+JOBS_URL = '/api/recipes/download_shopping_cart/jobs/'
+INGREDIENTS = [('Молоко', 200, 'мл'), ('Соль', 5, 'г')]
+
+
+class DocumentCacheTest(SimpleTestCase):
+    """Сохранённые документы списка покупок."""
+
+    def setUp(self):
+        cache_root = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_root.cleanup)
+        settings = override_settings(SHOPPING_LIST_CACHE_ROOT=cache_root.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_open_document_survives_eviction(self):
+        path = get_document_path(INGREDIENTS, 'txt')
+        with get_document(INGREDIENTS, 'txt') as document:
+            os.unlink(path)
+            self.assertIn('Молоко', document.read().decode())
+
+    def test_rendered_document_survives_eviction(self):
+        with get_document(INGREDIENTS, 'csv') as document:
+            os.unlink(get_cache_path(INGREDIENTS, 'csv'))
+            self.assertIn('Соль', document.read().decode())
+
+    def test_evicted_document_is_rendered_again(self):
+        path = get_document_path(INGREDIENTS, 'txt')
+        os.unlink(path)
+        with get_document(INGREDIENTS, 'txt') as document:
+            self.assertIn('Молоко', document.read().decode())
+        self.assertTrue(path.exists())
+
+    def test_response_after_eviction(self):
+        document = get_document(INGREDIENTS, 'txt')
+        os.unlink(get_cache_path(INGREDIENTS, 'txt'))
+        response = FileResponse(document, filename='shopping_list.txt')
+        self.assertIn('Соль', b''.join(response).decode())
+        response.close()
+
+
+class ShoppingListJobTest(TestCase):
+    """Зависшие, вытесненные и старые задачи списка покупок."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username='user',
+            email='user@example.com'
+        )
+        cls.token = Token.objects.create(user=cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def create_job(self, status, age, document=''):
+        job = ShoppingListJob.objects.create(
+            user=self.user,
+            document_format='txt',
+            status=status,
+            document=document
+        )
+        ShoppingListJob.objects.filter(id=job.id).update(
+            created_at=timezone.now() - timedelta(seconds=age)
+        )
+        return job
+
+    def get_status(self, job):
+        return self.client.get(f'{JOBS_URL}{job.id}/').data['status']
+
+    def test_stale_job_is_failed(self):
+        running = self.create_job(
+            ShoppingListJob.Status.RUNNING,
+            JOB_TIMEOUT + 1
+        )
+        pending = self.create_job(ShoppingListJob.Status.PENDING, 0)
+        self.assertEqual(
+            self.get_status(running),
+            ShoppingListJob.Status.FAILED
+        )
+        self.assertEqual(
+            self.get_status(pending),
+            ShoppingListJob.Status.PENDING
+        )
+
+    def test_done_job_without_document_is_failed(self):
+        job = self.create_job(
+            ShoppingListJob.Status.DONE,
+            0,
+            'shopping_lists/missing.txt'
+        )
+        self.assertEqual(self.get_status(job), ShoppingListJob.Status.FAILED)
+
+    def test_expire_jobs(self):
+        stale = self.create_job(
+            ShoppingListJob.Status.PENDING,
+            JOB_TIMEOUT + 1
+        )
+        old = self.create_job(ShoppingListJob.Status.DONE, JOB_MAX_AGE + 1)
+        expire_jobs()
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, ShoppingListJob.Status.FAILED)
+        self.assertFalse(ShoppingListJob.objects.filter(id=old.id).exists())
+
+
+class ShoppingListTotalsTest(TestCase):
+    """Суммы ингредиентов при добавлении рецепта в список покупок."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            username='user',
+            email='user@example.com'
+        )
+        cls.token = Token.objects.create(user=cls.user)
+        cls.ingredient = Ingredient.objects.create(
+            name='Молоко',
+            measurement_unit='мл'
+        )
+        cls.recipe = Recipe.objects.create(
+            author=cls.user,
+            name='Рецепт',
+            text='Описание',
+            cooking_time=10,
+            image='images/recipe.png'
+        )
+        IngredientRecipe.objects.create(
+            recipe=cls.recipe,
+            ingredient=cls.ingredient,
+            amount=200
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.url = f'/api/recipes/{self.recipe.id}/shopping_cart/'
+
+    def test_failed_totals_roll_back_add(self):
+        with mock.patch(
+            'shopping_list.signals.change_totals',
+            side_effect=IntegrityError
+        ):
+            with self.assertRaises(IntegrityError):
+                self.client.post(self.url)
+        self.assertFalse(ShoppingList.objects.exists())
+
+    def test_concurrently_created_total(self):
+        ShoppingListIngredient.objects.create(
+            user=self.user,
+            ingredient=self.ingredient,
+            total_amount=50
+        )
+        get_locked_totals = totals.get_locked_totals
+        with mock.patch.object(
+            totals,
+            'get_locked_totals',
+            side_effect=[{}, mock.DEFAULT],
+            wraps=get_locked_totals
+        ):
+            response = self.client.post(self.url)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            ShoppingListIngredient.objects.get().total_amount,
+            250
+        )
+
+    def test_rebuild_totals_command(self):
+        other = User.objects.create(username='other', email='o@example.com')
+        for user in (self.user, other):
+            ShoppingList.objects.create(user=user, recipe=self.recipe)
+        ShoppingListIngredient.objects.filter(user=other).update(
+            total_amount=1
+        )
+        with self.assertRaises(CommandError):
+            call_command(
+                'rebuild_shopping_list_totals',
+                check=True,
+                batch_size=1,
+                stdout=io.StringIO()
+            )
+        output = io.StringIO()
+        call_command('rebuild_shopping_list_totals', batch_size=1,
+                     stdout=output)
+        self.assertIn('Проверено пользователей: 2, исправлено: 1',
+                      output.getvalue())
+        self.assertEqual(
+            set(ShoppingListIngredient.objects.values_list(
+                'total_amount', flat=True
+            )),
+            {200}
+        )
@@ -0,0 +1,101 @@
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+from recipes.models import IngredientRecipe
+from shopping_list.models import ShoppingList, ShoppingListIngredient
+
+
+def change_totals(users, amounts):
+    """
+    Изменение сумм ингредиентов в списках покупок пользователей.
+
+    users — словарь {id пользователя: сколько раз изменение применяется},
+    amounts — словарь {id ингредиента: изменение количества}.
+    Недостающие строки сначала вставляются с нулевой суммой без учёта
+    конфликтов: строку, которую одновременно добавил другой запрос,
+    select_for_update затем прочитает уже зафиксированной.
+    """
+    amounts = {
+        ingredient_id: amount
+        for ingredient_id, amount in amounts.items()
+        if amount
+    }
+    if not users or not amounts:
+        return
+    with transaction.atomic():
+        items = get_locked_totals(users, amounts)
+        missing = [
+            ShoppingListIngredient(
+                user_id=user_id,
+                ingredient_id=ingredient_id,
+                total_amount=0
+            )
+            for user_id in users
+            for ingredient_id, amount in amounts.items()
+            if amount > 0 and (user_id, ingredient_id) not in items
+        ]
+        if missing:
+            ShoppingListIngredient.objects.bulk_create(
+                missing,
+                ignore_conflicts=True
+            )
+            items = get_locked_totals(users, amounts)
+        updated, deleted = [], []
+        for user_id, times in users.items():
+            for ingredient_id, amount in amounts.items():
+                item = items.get((user_id, ingredient_id))
+                if item is None:
+                    continue
+                item.total_amount += amount * times
+                if item.total_amount > 0:
+                    updated.append(item)
+                else:
+                    deleted.append(item.id)
+        ShoppingListIngredient.objects.bulk_update(updated, ['total_amount'])
+        ShoppingListIngredient.objects.filter(id__in=deleted).delete()
+
+
+def get_locked_totals(users, amounts):
+    """Заблокированные строки сумм по паре (пользователь, ингредиент)."""
+    return {
+        (item.user_id, item.ingredient_id): item
+        for item in ShoppingListIngredient.objects.select_for_update(
+        ).filter(
+            user_id__in=users,
+            ingredient_id__in=amounts
+        ).order_by()
+    }
+
+
+def get_recipe_amounts(recipe_id, sign=1):
+    """Получение количеств ингредиентов рецепта."""
+    amounts = defaultdict(int)
+    for ingredient_id, amount in IngredientRecipe.objects.filter(
+        recipe_id=recipe_id
+    ).order_by().values_list('ingredient_id', 'amount'):
+        amounts[ingredient_id] += sign * amount
+    return amounts
+
+
+def change_recipe_totals(recipe_id, amounts):
+    """Изменение сумм у всех пользователей с рецептом в списке покупок."""
+    if not any(amounts.values()):
+        return
+    change_totals(
+        Counter(ShoppingList.objects.filter(
+            recipe_id=recipe_id
+        ).values_list('user_id', flat=True)),
+        amounts
+    )
+
+
+def change_rows_totals(ingredient_recipes, sign=1):
+    """Учёт добавленных (sign=1) или удаляемых (sign=-1) строк рецептов."""
+    recipes = defaultdict(lambda: defaultdict(int))
+    for ingredient_recipe in ingredient_recipes:
+        recipes[ingredient_recipe.recipe_id][
+            ingredient_recipe.ingredient_id
+        ] += sign * ingredient_recipe.amount
+    for recipe_id, amounts in recipes.items():
+        change_recipe_totals(recipe_id, amounts)
@@ -10,6 +10,16 @@ from subscriptions.validators import (
 )
 
 
+def get_recipes_limit(request):
+    """Получение ограничения количества рецептов из запроса."""
+    if request is None:
+        return None
+    recipes_limit = request.query_params.get('recipes_limit')
+    if recipes_limit and recipes_limit.isdigit():
+        return int(recipes_limit)
+    return None
+
+
 class FollowSerializer(serializers.ModelSerializer):
     """Сериализатор для модели связи пользователя с подпиской."""
 
@@ -49,7 +59,7 @@ class SubscribtionsSerializer(UsersGetListSerializer):
     """Сериализатор для модели связи пользователя с подпиской."""
 
     recipes = serializers.SerializerMethodField()
-    recipes_count = serializers.ReadOnlyField(source='recipes.count')
+    recipes_count = serializers.SerializerMethodField()
 
     class Meta(UsersGetListSerializer.Meta):
         """Дополнительные настройки сериализатора."""
@@ -61,15 +71,21 @@ class SubscribtionsSerializer(UsersGetListSerializer):
 
     def get_recipes(self, obj):
         """Получение списка рецептов."""
-        recipes = obj.recipes.all()
-        context = self.context
-        if 'request' in context:
-            query_params = self.context.get('request').query_params
-            recipes_limit = query_params.get('recipes_limit')
-            if recipes_limit and recipes_limit.isdigit():
-                recipes = recipes[:int(recipes_limit)]
+        recipes = getattr(obj, 'recipe_previews', None)
+        if recipes is None:
+            recipes = obj.recipes.all()
+            recipes_limit = get_recipes_limit(self.context.get('request'))
+            if recipes_limit is not None:
+                recipes = recipes[:recipes_limit]
         return RecipeWithoutIngredientsTagsSerializer(
             recipes,
             many=True,
             context=self.context
         ).data
+
+    def get_recipes_count(self, obj):
+        """Получение количества рецептов."""
+        recipes_count = getattr(obj, 'recipes_count', None)
+        if recipes_count is not None:
+            return recipes_count
+        return obj.recipes.count()